@@ -3,7 +3,8 @@ from django.conf import settings
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
-from .models import SchoolYear, FAQ, Member, Event, EventAgendaItem, EventRSVP, EventAttendance, EventFeedback, Project, Update, RoadmapMilestone, Tag
+from django.utils import timezone
+from .models import SchoolYear, FAQ, Member, Event, EventAgendaItem, EventRSVP, EventAttendance, EventFeedback, Project, Update, RoadmapMilestone, Tag, CalendarSyncJob, Task, DeadTask
 
 admin.site.register(SchoolYear)
 admin.site.register(FAQ)
@@ -58,8 +59,15 @@ class EventRSVPInline(admin.TabularInline):
 class EventAttendanceInline(admin.TabularInline):
     model = EventAttendance
 
+def enroll_core_team(modeladmin, request, queryset):
+    core_team = User.objects.filter(is_staff=True)
+    for event in queryset:
+        event.enroll_users(core_team)
+enroll_core_team.short_description = 'RSVP and add attendance of core team'
+
 class EventAdmin(admin.ModelAdmin):
     date_hierarchy = 'start'
+    actions = [enroll_core_team]
     search_fields = ['title', 'tagline', 'description']
 
     # https://docs.djangoproject.com/en/dev/ref/contrib/admin/#modeladmin-options
@@ -72,9 +80,11 @@ class EventAdmin(admin.ModelAdmin):
         }),
         ('Advanced options', {
             'classes': ('collapse',),
-            'fields': ('attendance_code', 'slideshow_id', 'thumbnail_link', 'meeting_notes_id', 'calendar_event_id')
+            'fields': ('attendance_code', 'slideshow_id', ('thumbnail_link', 'thumbnail_refreshed_at'), 'meeting_notes_id', ('calendar_event_id', 'calendar_sync_status'))
         })
     )
+    # The calendar sync worker sets calendar_event_id, a form opened before it did must not clear it
+    readonly_fields = ('thumbnail_refreshed_at', 'calendar_event_id', 'calendar_sync_status')
 
     inlines = [
         EventAgendaItemInline,
@@ -83,6 +93,32 @@ class EventAdmin(admin.ModelAdmin):
     ]
 admin.site.register(Event, EventAdmin)
 
+def retry_jobs(modeladmin, request, queryset):
+    queryset.update(status='P', attempts=0, run_after=timezone.now(), last_error=None)
+retry_jobs.short_description = 'Retry selected jobs now'
+
+class CalendarSyncJobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'action', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('status', 'action')
+    readonly_fields = ('last_error',)
+    actions = [retry_jobs]
+admin.site.register(CalendarSyncJob, CalendarSyncJobAdmin)
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'queue', 'name', 'priority', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('queue', 'status', 'name')
+    readonly_fields = ('last_error',)
+    actions = [retry_jobs]
+admin.site.register(Task, TaskAdmin)
+
+class DeadTaskAdmin(TaskAdmin):
+    list_display = ('__str__', 'queue', 'name', 'attempts', 'last_error', 'updated_at')
+    list_filter = ('queue', 'name')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(status='F')
+admin.site.register(DeadTask, DeadTaskAdmin)
+
 # Re-register UserAdmin
 admin.site.unregister(User)
 admin.site.register(User, NewUserAdmin)
\ No newline at end of file
@@ -0,0 +1,91 @@
+'''
+Caches whole public pages for anonymous visitors, who all see the same page.
+
+Cache keys include a content version that is replaced whenever the content of those pages
+changes (events, updates or the core team, see the signals connected in models.py), so
+cached pages are never stale for longer than it takes to save the change. Pages also expire
+after ANONYMOUS_PAGE_CACHE_TIMEOUT since which events are ongoing or upcoming depends on the time.
+'''
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+CONTENT_VERSION_KEY = 'content-version'
+
+# Seconds to keep a page cached for anonymous visitors
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 300
+
+
+def get_content_version():
+    return cache.get_or_set(CONTENT_VERSION_KEY, uuid4().hex, None)
+
+
+def bump_content_version(*args, **kwargs):
+    '''Invalidates every cached page. Takes any arguments so it can be connected to signals directly.'''
+    cache.set(CONTENT_VERSION_KEY, uuid4().hex, None)
+
+
+def remember_user_staff_status(sender, instance, *args, **kwargs):
+    # Compared when the user is saved to tell whether they joined or left the core team
+    instance._saved_is_staff = instance.is_staff
+
+
+def bump_content_version_on_user_save(sender, instance, update_fields=None, *args, **kwargs):
+    '''
+    Only the core team is shown on cached pages, so sign ups and profile edits of other
+    users, which are most saves during busy times, keep the cached pages.
+    '''
+    # Logging in only saves last_login, which isn't shown anywhere
+    if update_fields == frozenset(['last_login']):
+        return
+    if instance.is_staff or getattr(instance, '_saved_is_staff', False):
+        bump_content_version()
+    instance._saved_is_staff = instance.is_staff
+
+
+def bump_content_version_on_user_delete(sender, instance, *args, **kwargs):
+    if instance.is_staff:
+        bump_content_version()
+
+
+def is_cacheable_request(request):
+    # Flash messages and sessions make the page personal
+    return (request.method in ('GET', 'HEAD') and not request.user.is_authenticated
+        and 'messages' not in request.COOKIES and settings.SESSION_COOKIE_NAME not in request.COOKIES)
+
+
+def cache_anonymous_page(*query_params):
+    '''
+    Serves the view's response from the cache to anonymous visitors. Pages that use a CSRF
+    token or set cookies are not cached since they differ per visitor.
+
+    Only the path and the given query parameters, which must be all the view reads, make up
+    the cache key. Other parameters (tracking tags or made up ones) share the page's entry
+    instead of each filling the cache with a copy.
+    '''
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            params = urlencode([(name, value) for name in sorted(query_params) for value in request.GET.getlist(name)])
+            path = hashlib.md5(f'{request.path}?{params}'.encode()).hexdigest()
+            key = f'anonymous-page:{get_content_version()}:{path}'
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            if (response.status_code == 200 and not response.streaming and not response.cookies
+                    and not request.META.get('CSRF_COOKIE_USED')):
+                cache.set(key, (response.content, response['Content-Type']), ANONYMOUS_PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
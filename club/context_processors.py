@@ -1,6 +1,14 @@
+from functools import lru_cache
+
 from django.conf import settings
 
-def add_school(request):
+
+@lru_cache(maxsize=None)
+def get_branding():
+    '''
+    The names and social media of the club. Settings don't change while the process runs,
+    so the dict is built once and shared by every render (templates receive a copy).
+    '''
     return {
         'school_name': settings.SCHOOL_NAME,
         'school_name_short': settings.SCHOOL_NAME_SHORT,
@@ -9,4 +17,7 @@ def add_school(request):
         'twitter_username': settings.TWITTER_USERNAME,
         'facebook_link': settings.FACEBOOK_LINK,
         'github_link': settings.GITHUB_LINK
-    }
\ No newline at end of file
+    }
+
+def add_school(request):
+    return get_branding()
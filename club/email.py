@@ -1,15 +1,27 @@
+import smtplib
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from django.core.mail import send_mail as sm
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
+from .context_processors import get_branding
 from .logger import logger
+from .instrumentation import record_external
 from html2text import html2text
 
 FROM = f'DSC {settings.SCHOOL_NAME_SHORT} <{settings.EMAIL_SENDER}>'
 
-def send_templated_email(subject, template, data, recipients):
+# Errors that mean the connection to the mail server is gone, rather than that a message was rejected
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+
+def render_templated_email(template, data):
+    '''
+    Renders the email template once and returns the (plaintext, HTML) bodies.
+    '''
     # https://stackoverflow.com/questions/2809547/creating-email-templates-with-django
-    data['github_link'] = settings.GITHUB_LINK
-    data['facebook_link'] = settings.FACEBOOK_LINK
+    # Emails are rendered without a request, so context processors don't add the branding
+    data = {**get_branding(), **data}
     html_message = render_to_string(f'club/emails/{template}.html', data)
     try:
         # Try to find the plaintext template
@@ -17,10 +29,101 @@ def send_templated_email(subject, template, data, recipients):
     except:
         # If it doesn't exist, fallback to just HTML
         plain_message = html2text(html_message)
+    return plain_message, html_message
+
+def _send_message(connection, message):
+    '''Sends the message, reopening the connection and trying once more if the server dropped it.'''
+    try:
+        with record_external('smtp'):
+            connection.send_messages([message])
+    except CONNECTION_ERRORS as e:
+        logger.warning(f'Lost the email connection, reconnecting: {e}')
+        connection.close()
+        with record_external('smtp'):
+            connection.open()
+            connection.send_messages([message])
+
+def _send_chunk(subject, plain_message, html_message, recipients, connection=None):
+    '''
+    Sends one message per recipient over a single connection, which is reopened if the server
+    drops it. Returns a dict of recipient to None on success or the error message on failure.
+    '''
+    results = {}
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        with record_external('smtp'):
+            connection.open()
+    except Exception as e:
+        logger.error(f'Could not open email connection: {e}')
+        return {recipient: str(e) for recipient in recipients}
+
+    try:
+        for index, recipient in enumerate(recipients):
+            message = EmailMultiAlternatives(subject, plain_message, FROM, [recipient], connection=connection)
+            message.attach_alternative(html_message, 'text/html')
+            try:
+                _send_message(connection, message)
+            except CONNECTION_ERRORS as e:
+                # Reconnecting didn't help either, so the rest of the chunk can't be sent now
+                logger.error(f'Could not reconnect to send email: {e}')
+                results.update({recipient: str(e) for recipient in recipients[index:]})
+                break
+            except Exception as e:
+                results[recipient] = str(e)
+            else:
+                results[recipient] = None
+    finally:
+        connection.close()
+    return results
+
+def send_bulk_email(subject, plain_message, html_message, recipients, chunk_size=None, workers=None):
+    '''
+    Sends the same email individually to every recipient.
+
+    Recipients are split into chunks of `chunk_size` and every chunk reuses one connection.
+    With more than one worker, chunks are sent in parallel on a thread pool.
+    Returns a dict of recipient to None on success or the error message on failure.
+    '''
+    chunk_size = chunk_size or settings.EMAIL_BATCH_SIZE
+    workers = workers or settings.EMAIL_SEND_WORKERS
+    chunks = [recipients[i:i + chunk_size] for i in range(0, len(recipients), chunk_size)]
+
+    results = {}
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            for chunk_results in executor.map(lambda chunk: _send_chunk(subject, plain_message, html_message, chunk), chunks):
+                results.update(chunk_results)
+    else:
+        for chunk in chunks:
+            results.update(_send_chunk(subject, plain_message, html_message, chunk))
+
+    failed = [recipient for recipient, error in results.items() if error]
+    if failed:
+        logger.error(f'Failed to send email with subject "{subject}" to {len(failed)} of {len(recipients)} recipients: {failed}')
+    return results
+
+def queue_templated_email(subject, template, data, recipients, priority=None):
+    '''
+    Renders the template now and queues the email to be sent by the `run_mail_worker` command,
+    so the request doesn't wait on SMTP. Lower priorities are sent first.
+
+    Every EMAIL_BATCH_SIZE recipients get their own task, so a newsletter to every member
+    doesn't hold up a more urgent email queued after it for longer than one batch takes.
+    '''
+    # The models import this module, so Task can't be imported at the top
+    from .models import Task
 
-    logger.info(f'Sending email with subject "{subject}" to {recipients} with template "{template}"')
-    for recipient in recipients:
-        sm(subject, plain_message, FROM, [recipient], html_message=html_message, fail_silently=False)
+    plain_message, html_message = render_templated_email(template, data)
+    recipients = list(recipients)
+    logger.info(f'Queueing email with subject "{subject}" to {len(recipients)} recipient(s) with template "{template}"')
+    chunk_size = settings.EMAIL_BATCH_SIZE
+    payloads = [{
+        'subject': subject,
+        'plain_message': plain_message,
+        'html_message': html_message,
+        'recipients': recipients[i:i + chunk_size]
+    } for i in range(0, len(recipients), chunk_size)]
+    return Task.enqueue_many('mail', 'send_email', payloads, priority=Task.PRIORITY_NORMAL if priority is None else priority)
     
 def send_email(subject, body, recipients):
     '''
@@ -31,4 +134,5 @@ def send_email(subject, body, recipients):
     recipients: list
     '''
     logger.info(f'Sending email with subject "{subject}" to {recipients}')
-    return sm(subject, html2text(body), FROM, recipients, html_message=body, fail_silently=False)
\ No newline at end of file
+    with record_external('smtp'):
+        return sm(subject, html2text(body), FROM, recipients, html_message=body, fail_silently=False)
@@ -13,6 +13,21 @@ class MemberAccountForm(forms.Form):
     dietary_restrictions = forms.ModelMultipleChoiceField(queryset=Tag.dietary_restrictions.all(), widget=forms.CheckboxSelectMultiple, label='My dietary preferences/restrictions are', required=False)
     profile_image = forms.ImageField(required=False)
 
+    # Limits for uploaded profile images
+    PROFILE_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+    PROFILE_IMAGE_MAX_PIXELS = 40 * 1000 * 1000
+
+    def clean_profile_image(self):
+        profile_image = self.cleaned_data['profile_image']
+        if profile_image:
+            if profile_image.size > self.PROFILE_IMAGE_MAX_BYTES:
+                raise forms.ValidationError('Profile images must be smaller than 10 MB.')
+            # Set by ImageField after Pillow has read the image
+            width, height = profile_image.image.size
+            if width * height > self.PROFILE_IMAGE_MAX_PIXELS:
+                raise forms.ValidationError('Profile images must be smaller than 40 megapixels.')
+        return profile_image
+
 class EventFeedbackForm(forms.ModelForm):
 
     class Meta:
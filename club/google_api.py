@@ -1,9 +1,114 @@
+'''
+Google API clients. Each client is built the first time it is used and then cached, so
+importing this module (and the models/views that do) stays cheap.
+
+httplib2, which the clients send requests with, is not thread-safe. Every thread therefore
+gets its own clients sharing one authorized HTTP transport, which is reused for all of the
+thread's requests so connections to Google are kept alive.
+
+Discovery documents are read from club/discovery when available instead of being fetched
+from Google; refresh them with `python manage.py update_discovery_docs`.
+'''
+import os
+import threading
+from functools import lru_cache
 from django.conf import settings
-from googleapiclient.discovery import build
+from django.core.cache import cache
+
+from .instrumentation import instrument_http
+
+DISCOVERY_DOCS_DIR = os.path.join(os.path.dirname(__file__), 'discovery')
+
+# The APIs used by the club and their versions
+APIS = {
+    'docs': 'v1',
+    'slides': 'v1',
+    'drive': 'v3',
+    'calendar': 'v3'
+}
+
+# Seconds to wait for Google before giving up on a request
+HTTP_TIMEOUT = 30
+
+_local = threading.local()
+
+def discovery_doc_path(api, version):
+    return os.path.join(DISCOVERY_DOCS_DIR, f'{api}.{version}.json')
+
+@lru_cache(maxsize=None)
+def get_discovery_doc(api, version):
+    '''The bundled discovery document of the API, read once per process, or None if it isn't bundled.'''
+    path = discovery_doc_path(api, version)
+    if not os.path.exists(path):
+        return None
+    with open(path) as discovery_doc:
+        return discovery_doc.read()
+
+def get_authorized_http():
+    '''The current thread's authorized HTTP transport, shared by all of its clients.'''
+    if not hasattr(_local, 'http'):
+        # These are slow to import so they are only loaded when a client is first needed
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        http = AuthorizedHttp(settings.GS_CREDENTIALS, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        _local.http = instrument_http(http, 'google')
+    return _local.http
+
+def get_service(api, version):
+    '''Returns the current thread's client for the Google API (e.g. "calendar", "v3"), building it on first use.'''
+    if not hasattr(_local, 'services'):
+        _local.services = {}
+    if (api, version) not in _local.services:
+        from googleapiclient.discovery import build, build_from_document
+
+        discovery_doc = get_discovery_doc(api, version)
+        if discovery_doc is not None:
+            service = build_from_document(discovery_doc, http=get_authorized_http())
+        else:
+            service = build(api, version, http=get_authorized_http(), cache_discovery=False)
+        _local.services[(api, version)] = service
+    return _local.services[(api, version)]
+
+class LazyService:
+    '''
+    Stands in for a Google API client. Attribute access is forwarded to the current
+    thread's client, which is built on first use.
+    '''
+    def __init__(self, api):
+        self.api = api
+        self.version = APIS[api]
+
+    def __getattr__(self, name):
+        return getattr(get_service(self.api, self.version), name)
+
+docs_service = LazyService('docs')
+slides_service = LazyService('slides')
+drive_service = LazyService('drive')
+calendar_service = LazyService('calendar')
 
-credentials = settings.GS_CREDENTIALS
+SLIDESHOW_CATALOG_CACHE_KEY = 'google-drive-slideshow-catalog'
+# Seconds the slideshow catalog is cached for
+SLIDESHOW_CATALOG_TIMEOUT = 60 * 15
 
-docs_service = build('docs', 'v1', credentials=credentials)
-slides_service = build('slides', 'v1', credentials=credentials)
-drive_service = build('drive', 'v3', credentials=credentials)
-calendar_service = build('calendar', 'v3', credentials=credentials)
\ No newline at end of file
+def list_slideshows(refresh=False):
+    '''
+    Returns the id and name of every file in the club's slide decks folder. The catalog is
+    cached for SLIDESHOW_CATALOG_TIMEOUT seconds; pass refresh=True to fetch it from Drive again.
+    '''
+    slideshows = None if refresh else cache.get(SLIDESHOW_CATALOG_CACHE_KEY)
+    if slideshows is None:
+        slideshows = []
+        page_token = None
+        while True:
+            response = drive_service.files().list(corpora='user',
+                                                  q=f"'{settings.GOOGLE_DRIVE_SLIDE_DECKS_FOLDER_ID}' in parents",
+                                                  fields='nextPageToken, files(id, name)',
+                                                  orderBy='name',
+                                                  pageSize=1000,
+                                                  pageToken=page_token).execute()
+            slideshows += response.get('files', [])
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        cache.set(SLIDESHOW_CATALOG_CACHE_KEY, slideshows, SLIDESHOW_CATALOG_TIMEOUT)
+    return slideshows
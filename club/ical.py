@@ -0,0 +1,66 @@
+'''
+Builds iCalendar (RFC 5545) feeds of events so calendar apps can subscribe to them
+directly instead of going through the Google Calendar.
+'''
+from datetime import timezone
+
+from django.conf import settings
+
+# Lines longer than this many octets must be folded
+MAX_LINE_LENGTH = 75
+
+
+def escape(text):
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def fold(line):
+    '''Splits a content line into lines of at most 75 octets without breaking up UTF-8 characters.'''
+    parts = []
+    current, length = '', 0
+    for character in line:
+        size = len(character.encode())
+        if length + size > MAX_LINE_LENGTH:
+            parts.append(current)
+            # Continuation lines start with a space, which counts towards their length
+            current, length = ' ', 1
+        current += character
+        length += size
+    parts.append(current)
+    return '\r\n'.join(parts)
+
+
+def format_datetime(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_lines(event):
+    return [
+        'BEGIN:VEVENT',
+        f'UID:event-{event.id}@{settings.WEBSITE}',
+        f'DTSTAMP:{format_datetime(event.updated_at)}',
+        f'LAST-MODIFIED:{format_datetime(event.updated_at)}',
+        f'DTSTART:{format_datetime(event.start)}',
+        f'DTEND:{format_datetime(event.end)}',
+        f'SUMMARY:{escape(event.title)}: {escape(event.get_event_type_display())}',
+        f'LOCATION:{escape(event.location)}',
+        f'DESCRIPTION:{escape(event.description)}',
+        f'URL:{settings.DOMAIN}/events/{event.id}',
+        'END:VEVENT'
+    ]
+
+
+def render_calendar(name, events):
+    '''The iCalendar file for the events as bytes, ready to be served as text/calendar.'''
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:-//DSC {escape(settings.SCHOOL_NAME_SHORT)}//Events//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape(name)}'
+    ]
+    for event in events:
+        lines += event_lines(event)
+    lines.append('END:VCALENDAR')
+    return ''.join(fold(line) + '\r\n' for line in lines).encode()
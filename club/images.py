@@ -0,0 +1,54 @@
+import hashlib
+from io import BytesIO
+
+from PIL import Image, ImageOps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# The (Pillow format, file extension) every variant is saved in
+VARIANT_FORMATS = [
+    ('JPEG', 'jpg'),
+    ('WEBP', 'webp')
+]
+
+def variant_name(prefix, digest, width, extension):
+    '''The storage name of one variant of a stored image.'''
+    return f'{prefix}/{digest}-{width}.{extension}'
+
+def variant_url(prefix, digest, width, extension='jpg'):
+    return default_storage.url(variant_name(prefix, digest, width, extension))
+
+def variant_srcset(prefix, digest, widths, extension='jpg'):
+    '''A srcset attribute value listing the variant of every width.'''
+    return ', '.join(f'{variant_url(prefix, digest, width, extension)} {width}w' for width in widths)
+
+def save_image_variants(data, prefix, widths, square=False):
+    '''
+    Saves downscaled JPEG and WebP copies of the image (given as bytes) in each of the widths
+    through the default file storage. Names are derived from the SHA-256 of the image, so a
+    name always refers to the same content and existing variants are not uploaded again.
+    With square=True the image is center-cropped to a square first.
+
+    EXIF metadata is not copied into the variants. Returns the digest to pass to
+    variant_url() and variant_srcset(). Raises OSError if the data is not an image.
+    '''
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    image = Image.open(BytesIO(data))
+    # Apply the EXIF orientation since the EXIF data itself is dropped
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    if square:
+        size = min(image.size)
+        image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+
+    for width in widths:
+        resized = image.copy()
+        # Only ever scales down and keeps the aspect ratio
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+        for image_format, extension in VARIANT_FORMATS:
+            name = variant_name(prefix, digest, width, extension)
+            if default_storage.exists(name):
+                continue
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=85)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+    return digest
@@ -0,0 +1,134 @@
+'''
+Per-request instrumentation. InstrumentationMiddleware counts the SQL queries of every
+request and times them, along with calls to external services (Google APIs, other HTTP
+APIs made with requests such as Slack, and SMTP), then logs one line per request and
+adds a Server-Timing header for the core team so the numbers show up in the browser's
+developer tools.
+
+It is turned on by the REQUEST_INSTRUMENTATION setting. Outside of an instrumented
+request the hooks below only check a thread local, so they are cheap to leave installed.
+'''
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .logger import logger
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.view = None
+        self.query_count = 0
+        self.query_time = 0.0
+        # Service name to [call count, total seconds]
+        self.external = {}
+
+    def add_external(self, service, duration):
+        calls = self.external.setdefault(service, [0, 0.0])
+        calls[0] += 1
+        calls[1] += duration
+
+
+def current_metrics():
+    '''The metrics of the request the current thread is handling, or None.'''
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def record_external(service):
+    '''Times the block as a call to the external service if a request is being instrumented.'''
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_external(service, time.perf_counter() - start)
+
+
+def instrument_http(http, service):
+    '''Wraps the request method of an httplib2-style transport (like the Google API clients use).'''
+    request = http.request
+
+    def instrumented_request(*args, **kwargs):
+        with record_external(service):
+            return request(*args, **kwargs)
+    http.request = instrumented_request
+    return http
+
+
+def service_name(url):
+    '''A short name for the external service behind a URL, e.g. "slack" for https://slack.com/api/...'''
+    host = urlsplit(url).hostname or 'unknown'
+    if host.endswith('slack.com'):
+        return 'slack'
+    if host.endswith(('googleapis.com', 'googleusercontent.com')):
+        return 'google'
+    return 'http'
+
+
+def install_requests_hook():
+    '''Times every request sent with the requests library, which the club uses for Slack and image downloads.'''
+    import requests
+
+    if getattr(requests.Session.send, 'instrumented', False):
+        return
+    send = requests.Session.send
+
+    def instrumented_send(self, request, **kwargs):
+        with record_external(service_name(request.url)):
+            return send(self, request, **kwargs)
+    instrumented_send.instrumented = True
+    requests.Session.send = instrumented_send
+
+
+class InstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        install_requests_hook()
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics = _local.metrics
+            metrics.query_count += 1
+            metrics.query_time += time.perf_counter() - start
+
+    def __call__(self, request):
+        metrics = _local.metrics = RequestMetrics()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self.record_query):
+                response = self.get_response(request)
+        finally:
+            _local.metrics = None
+        total = time.perf_counter() - start
+
+        external = ' '.join(f'{service}={count}/{duration * 1000:.1f}ms' for service, (count, duration) in sorted(metrics.external.items()))
+        logger.info(
+            f'{request.method} {request.path} view={metrics.view} status={response.status_code} '
+            f'total={total * 1000:.1f}ms queries={metrics.query_count} db={metrics.query_time * 1000:.1f}ms {external}'.rstrip())
+
+        user = getattr(request, 'user', None)
+        if settings.DEBUG or (user is not None and user.is_staff):
+            timings = [f'db;dur={metrics.query_time * 1000:.1f};desc="{metrics.query_count} queries"']
+            timings += [f'{service};dur={duration * 1000:.1f};desc="{count} calls"' for service, (count, duration) in sorted(metrics.external.items())]
+            timings.append(f'total;dur={total * 1000:.1f}')
+            response['Server-Timing'] = ', '.join(timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _local.metrics.view = getattr(view_func, '__name__', repr(view_func))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class WorkerCommand(BaseCommand):
+    '''
+    Base for management commands that poll the database for queued jobs.
+    Subclasses implement `process()` which runs due jobs and returns how many ran.
+    '''
+    # Seconds to sleep when there was nothing to do
+    default_interval = 5
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process due jobs once and exit instead of polling.')
+        parser.add_argument('--interval', type=float, default=self.default_interval, help='Seconds to wait between polls when idle.')
+
+    def process(self, **options):
+        raise NotImplementedError('subclasses of WorkerCommand must provide a process() method')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process(**options)
+            if processed:
+                self.stdout.write(f'Processed {processed} job(s).')
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,114 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from club.models import Event, Member, FAQ, Update, Tag
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a large synthetic dataset and reports the query plan and timing of the main query of each view. '
+        'Everything runs in a transaction that is rolled back, so the database is left untouched. '
+        'Pass --without-indexes to see how the queries behave without the indexes on the filtered columns.'
+    )
+
+    # The models whose Meta.indexes back the queries below
+    indexed_models = [Event, Member, FAQ, Update, Tag]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=5000, help='How many events to seed.')
+        parser.add_argument('--members', type=int, default=5000, help='How many members to seed.')
+        parser.add_argument('--repeat', type=int, default=20, help='How many times to run each query.')
+        parser.add_argument('--without-indexes', action='store_true', help='Drop the indexes before running the queries.')
+
+    def queries(self):
+        now = timezone.now()
+        today = now.date()
+        return [
+            ('index: ongoing event', Event.objects.filter(start__lte=now, end__gte=now, hidden=False)),
+            ('index: closest public event', Event.public_events.order_by('-start')[:1]),
+            ('event_index: upcoming events', Event.public_events.filter(start__gte=today).order_by('start')),
+            ('event_index: past events (staff)', Event.objects.filter(end__lt=today).order_by('-start', '-id')[:21]),
+            ('event_index: past events', Event.public_events.filter(end__lt=today).order_by('-start', '-id')[:21]),
+            ('member_index: verified members', Member.verified_members.select_related('user').order_by('user__first_name', 'user__last_name', 'id')[:48]),
+            ('member_index: search', Member.verified_members.select_related('user').filter(search_text__contains='benchmark-12').order_by('user__first_name', 'user__last_name', 'id')[:48]),
+            ('faq: answered questions', FAQ.objects.filter(answer__isnull=False)),
+            ('update_index: public updates', Update.objects.filter(hidden=False).order_by('created_at')),
+            ('account: skill tags', Tag.skills.all()),
+        ]
+
+    def seed(self, event_count, member_count):
+        now = timezone.now()
+        event_types = [event_type for event_type, name in Event.EVENT_TYPES]
+        events = []
+        for i in range(event_count):
+            start = now + timedelta(days=random.randint(-365 * 5, 60), hours=random.randint(0, 23))
+            events.append(Event(
+                event_type=random.choice(event_types),
+                hidden=random.random() < 0.05,
+                title=f'Benchmark event {i}',
+                description='Synthetic event',
+                location='Benchmark Hall',
+                start=start,
+                end=start + timedelta(hours=2),
+                attendance_code='BENCHM'
+            ))
+        Event.objects.bulk_create(events, batch_size=500)
+
+        users = User.objects.bulk_create([User(username=f'benchmark-{i}') for i in range(member_count)], batch_size=500)
+        if not users[0].pk:
+            # Backends that don't return primary keys from bulk inserts
+            users = User.objects.filter(username__startswith='benchmark-')
+        # bulk_create() skips the signal that fills in search_text
+        Member.objects.bulk_create([Member(user=user, verified=random.random() < 0.7, search_text=user.username) for user in users], batch_size=500)
+
+        FAQ.objects.bulk_create([FAQ(question=f'Question {i}?', answer=f'Answer {i}' if i % 4 else None) for i in range(member_count // 10)])
+        Update.objects.bulk_create([Update(title=f'Update {i}', body='Synthetic update', hidden=i % 10 == 0) for i in range(event_count // 10)])
+        Tag.objects.bulk_create([Tag(tag_type=random.choice('DS'), title=f'Tag {i}') for i in range(200)])
+
+    def drop_indexes(self):
+        # The schema editor is only used to generate the SQL; SQLite doesn't allow
+        # entering it inside the transaction that is rolled back afterwards.
+        schema_editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in self.indexed_models:
+                for index in model._meta.indexes:
+                    cursor.execute(str(index.remove_sql(model, schema_editor)))
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.stdout.write(f'Seeding {options["events"]} events and {options["members"]} members...')
+                self.seed(options['events'], options['members'])
+                if options['without_indexes']:
+                    self.stdout.write('Dropping indexes...')
+                    self.drop_indexes()
+                if connection.vendor in ('postgresql', 'sqlite'):
+                    # Refresh the planner statistics so it knows about the seeded rows
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+
+                for name, queryset in self.queries():
+                    timings = []
+                    for i in range(options['repeat']):
+                        start = time.perf_counter()
+                        list(queryset.all())
+                        timings.append((time.perf_counter() - start) * 1000)
+
+                    self.stdout.write(self.style.MIGRATE_HEADING(name))
+                    self.stdout.write(f'median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms')
+                    self.stdout.write(queryset.explain())
+                    self.stdout.write('')
+                raise Rollback()
+        except Rollback:
+            pass
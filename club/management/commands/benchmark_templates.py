@@ -0,0 +1,63 @@
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports how long the configured context processors and rendering a template for an anonymous '
+        'visitor take. Templates are loaded through the cached loader like in production, so the timings '
+        'don\'t include parsing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('template', nargs='?', default='club/base.html', help='The template to render.')
+        parser.add_argument('--repeat', type=int, default=2000, help='How many times to render the template.')
+
+    def make_engine(self):
+        '''A copy of the configured template engine that always uses the cached loader.'''
+        configured = engines['django'].engine
+        return Engine(
+            dirs=configured.dirs,
+            context_processors=configured.context_processors,
+            loaders=[('django.template.loaders.cached.Loader', ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader'])],
+            string_if_invalid=configured.string_if_invalid,
+            libraries=configured.libraries,
+        )
+
+    def make_request(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        request.session = SessionBase()
+        return request
+
+    def report(self, name, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95)]
+        self.stdout.write(f'{name}: median {statistics.median(timings):.1f} µs, p95 {p95:.1f} µs')
+
+    def handle(self, *args, **options):
+        engine = self.make_engine()
+        template = engine.get_template(options['template'])
+        request = self.make_request()
+
+        for processor in engine.template_context_processors:
+            timings = []
+            for i in range(options['repeat']):
+                start = time.perf_counter()
+                processor(request)
+                timings.append((time.perf_counter() - start) * 1000000)
+            self.report(f'{processor.__module__}.{processor.__name__}', timings)
+
+        template.render(RequestContext(request))
+        timings = []
+        for i in range(options['repeat']):
+            start = time.perf_counter()
+            template.render(RequestContext(request))
+            timings.append((time.perf_counter() - start) * 1000000)
+        self.report(f'render {options["template"]}', timings)
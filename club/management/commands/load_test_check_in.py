@@ -0,0 +1,144 @@
+import queue
+import statistics
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.middleware.csrf import _get_new_csrf_token
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from club.models import Event, EventAttendance, Member
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulates a room full of members submitting the attendance code at once: creates an ongoing event '
+        'and verified members, has them all check in concurrently and reports the latency percentiles. '
+        'Fails if the p99 latency is above --p99-target. Everything it creates is deleted afterwards. '
+        'With --url the check-ins are sent over HTTP to a running server that uses the same database, '
+        'otherwise they go through the test client in this process.'
+    )
+
+    ATTENDANCE_CODE = 'LOADTS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500, help='How many members check in.')
+        parser.add_argument('--concurrency', type=int, default=500, help='How many check-ins are sent at the same time.')
+        parser.add_argument('--p99-target', type=float, default=250, help='The highest acceptable p99 latency in milliseconds.')
+        parser.add_argument('--url', help='The address of a running server to check in at, e.g. https://staging.example.com')
+
+    def setup(self, user_count):
+        now = timezone.now()
+        # A hidden core team meeting so nothing is synced to the calendar or shown publicly
+        self.event = Event.objects.create(event_type='CT', hidden=True, title='Check-in load test', description='Load test',
+            location='Load Test Hall', start=now - timedelta(hours=1), end=now + timedelta(hours=1), attendance_code=self.ATTENDANCE_CODE)
+        User.objects.bulk_create([User(username=f'check-in-load-test-{i}') for i in range(user_count)])
+        self.users = list(User.objects.filter(username__startswith='check-in-load-test-'))
+        Member.objects.bulk_create([Member(user=user, verified=True) for user in self.users])
+
+        self.clients = []
+        for user in self.users:
+            client = Client(HTTP_HOST=settings.WEBSITE)
+            client.force_login(user)
+            self.session_keys.append(client.session.session_key)
+            self.clients.append(self.http_client(client) if self.url else client)
+
+    def http_client(self, client):
+        '''A keep-alive HTTP session logged in with the test client's session, like a member's phone.'''
+        session = requests.Session()
+        csrf_token = _get_new_csrf_token()
+        session.cookies.set(settings.SESSION_COOKIE_NAME, client.cookies[settings.SESSION_COOKIE_NAME].value)
+        session.cookies.set(settings.CSRF_COOKIE_NAME, csrf_token)
+        # HTTPS requests also need a referer from the same site to pass the CSRF check
+        session.headers.update({'X-CSRFToken': csrf_token, 'Referer': self.url})
+        return session
+
+    def cleanup(self):
+        Session.objects.filter(session_key__in=self.session_keys).delete()
+        User.objects.filter(username__startswith='check-in-load-test-').delete()
+        self.event.delete()
+
+    def check_in(self, client):
+        path = reverse('event_check_in', args=[self.event.id])
+        data = {'attendance-code': self.ATTENDANCE_CODE}
+        start = time.perf_counter()
+        if self.url:
+            try:
+                status = client.post(self.url + path, data, allow_redirects=False, timeout=60).status_code
+            except requests.RequestException as e:
+                # Counted as a failed check-in, e.g. when the server refused the connection
+                status = type(e).__name__
+        else:
+            status = client.post(path, data, secure=True).status_code
+        return status, (time.perf_counter() - start) * 1000
+
+    def worker(self, clients, results):
+        # Like a server thread, each worker keeps its database connection for all of its requests
+        try:
+            while True:
+                try:
+                    client = clients.get_nowait()
+                except queue.Empty:
+                    return
+                results.append(self.check_in(client))
+        finally:
+            connection.close()
+
+    def warn_about_environment(self):
+        '''Points out when the run is not comparable to production, so a pass there isn't taken as meeting the target.'''
+        if not self.url:
+            self.stdout.write(self.style.WARNING('Checking in through the test client in this process. '
+                'Use --url to measure a real server.'))
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(f'Running against {connection.vendor}, not PostgreSQL. '
+                'The latencies are not representative of production.'))
+        backend = settings.CACHES['default']['BACKEND']
+        if backend != 'django_redis.cache.RedisCache':
+            self.stdout.write(self.style.WARNING(f'The cache is {backend}, not Redis. '
+                'Cached check-in windows and sessions cost a different amount than in production.'))
+
+    def handle(self, *args, **options):
+        self.url = options['url'].rstrip('/') if options['url'] else None
+        self.warn_about_environment()
+        self.stdout.write(f'Creating {options["users"]} members...')
+        self.session_keys = []
+        self.setup(options['users'])
+        try:
+            self.stdout.write(f'Checking in with {options["concurrency"]} concurrent requests...')
+            clients = queue.Queue()
+            for client in self.clients:
+                clients.put(client)
+            results = []
+            threads = [threading.Thread(target=self.worker, args=(clients, results)) for i in range(options['concurrency'])]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            statuses = Counter(status for status, duration in results)
+            timings = sorted(duration for status, duration in results)
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            recorded = EventAttendance.objects.filter(event=self.event, user__in=self.users).count()
+
+            self.stdout.write(f'Statuses: {dict(statuses)}, attendance recorded for {recorded} of {len(self.users)} members')
+            self.stdout.write(f'{len(results) / elapsed:.0f} check-ins/s, median {statistics.median(timings):.1f} ms, '
+                f'p95 {timings[int(len(timings) * 0.95)]:.1f} ms, p99 {p99:.1f} ms, max {timings[-1]:.1f} ms')
+        finally:
+            self.cleanup()
+
+        if statuses != Counter({200: len(self.users)}) or recorded != len(self.users):
+            raise CommandError('Not every check-in succeeded.')
+        if p99 > options['p99_target']:
+            raise CommandError(f'p99 latency {p99:.1f} ms is above the target of {options["p99_target"]} ms.')
+        self.stdout.write(self.style.SUCCESS(f'p99 latency is within the target on {connection.vendor}.'))
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from club.models import Event, Task
+
+
+class Command(BaseCommand):
+    help = (
+        'Queues a new attempt at saving the thumbnail of every slideshow that has no stored thumbnail yet. '
+        'Until then events show Google\'s link, which only works for about 30 minutes, so schedule this to run every 10 minutes.'
+    )
+
+    def failed_at(self):
+        '''When the thumbnail task of each event last failed for good, by event ID.'''
+        failed_at = {}
+        for task in Task.objects.filter(queue='google', name='resolve_event_thumbnail', status='F').only('payload', 'updated_at'):
+            event_id = task.data['event_id']
+            failed_at[event_id] = max(task.updated_at, failed_at.get(event_id, task.updated_at))
+        return failed_at
+
+    def handle(self, *args, **options):
+        stale = timezone.now() - timedelta(seconds=Event.THUMBNAIL_LINK_MAX_AGE)
+        events = Event.objects.filter(slideshow_id__isnull=False, thumbnail_hash__isnull=True).exclude(slideshow_id='').filter(
+            Q(thumbnail_refreshed_at__isnull=True) | Q(thumbnail_refreshed_at__lt=stale))
+        failed_at = self.failed_at()
+        count = skipped = 0
+        for event in events.only('pk', 'updated_at'):
+            # A slideshow that was deleted or isn't shared with us keeps failing, so it is only
+            # tried again once the event changes or the dead letter is retried in the admin
+            if event.pk in failed_at and failed_at[event.pk] >= event.updated_at:
+                skipped += 1
+                continue
+            event.queue_thumbnail(priority=Task.PRIORITY_LOW)
+            count += 1
+        self.stdout.write(f'Queued {count} thumbnail refresh(es), skipped {skipped} event(s) whose thumbnail kept failing.')
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from club.caching import bump_content_version
+from club.models import Event, EventAgendaItem, Update, render_markdown
+
+
+class Command(BaseCommand):
+    help = (
+        'Renders the stored HTML of Markdown fields, which is otherwise only done when an object is saved. '
+        'Only fills in missing HTML unless --all is passed, e.g. after MARKDOWN_FILTER_WHITELIST_TAGS changed.'
+    )
+
+    # Model, Markdown field and the field its HTML is stored in
+    fields = [
+        (Event, 'description', 'description_html'),
+        (EventAgendaItem, 'description', 'description_html'),
+        (Update, 'body', 'body_html'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Render every object instead of only those missing HTML.')
+
+    def handle(self, *args, **options):
+        for model, source, target in self.fields:
+            objects = model.objects.only('pk', source, target)
+            if not options['all']:
+                objects = objects.filter(**{target: ''}).exclude(**{source: ''}).exclude(**{f'{source}__isnull': True})
+
+            rendered = []
+            for obj in objects.iterator():
+                setattr(obj, target, render_markdown(getattr(obj, source)))
+                rendered.append(obj)
+            # Bypasses save() and its signals (e.g. queueing calendar syncs), only the HTML changes
+            model.objects.bulk_update(rendered, [target], batch_size=500)
+            self.stdout.write(f'Rendered {len(rendered)} {model._meta.verbose_name_plural}.')
+        bump_content_version()
@@ -0,0 +1,10 @@
+from club.models import CalendarSyncJob
+
+from ._worker import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Pushes queued Event changes to the club Google Calendar.'
+
+    def process(self, **options):
+        return CalendarSyncJob.process_due()
@@ -0,0 +1,10 @@
+from club.models import Task
+
+from ._worker import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Sends queued emails, highest priority first.'
+
+    def process(self, **options):
+        return Task.process_queue('mail')
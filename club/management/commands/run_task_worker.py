@@ -0,0 +1,14 @@
+from club.models import Task
+
+from ._worker import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Runs queued background tasks from the given queues, highest priority first.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--queue', action='append', required=True, help='A queue to take tasks from, e.g. "google". Can be repeated.')
+
+    def process(self, **options):
+        return sum(Task.process_queue(queue) for queue in options['queue'])
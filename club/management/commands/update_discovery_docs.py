@@ -0,0 +1,16 @@
+import requests
+from django.core.management.base import BaseCommand
+
+from club.google_api import APIS, discovery_doc_path
+
+
+class Command(BaseCommand):
+    help = 'Downloads the discovery documents of the Google APIs the club uses into club/discovery.'
+
+    def handle(self, *args, **options):
+        for api, version in APIS.items():
+            response = requests.get(f'https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest', timeout=30)
+            response.raise_for_status()
+            with open(discovery_doc_path(api, version), 'w') as discovery_doc:
+                discovery_doc.write(response.text)
+            self.stdout.write(f'Updated {api} {version}')
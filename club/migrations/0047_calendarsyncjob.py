@@ -0,0 +1,37 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0046_auto_20200226_1150'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarSyncJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('D', 'Done'), ('F', 'Failed')], default='P', help_text='Pending jobs are picked up by the worker once run_after has passed.', max_length=1)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='How many times the job has been tried.')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='The job will not be tried before this time.')),
+                ('last_error', models.TextField(blank=True, help_text='The error from the last failed attempt.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('action', models.CharField(choices=[('S', 'Sync'), ('D', 'Delete')], help_text='Sync creates, updates or removes the calendar event to match the Event. Delete removes a calendar event whose Event no longer exists.', max_length=1)),
+                ('calendar_event_id', models.CharField(blank=True, help_text='The Google Calendar event ID to delete.', max_length=300, null=True)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='calendar_sync_jobs', to='club.Event')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='calendarsyncjob',
+            index=models.Index(fields=['status', 'run_after'], name='club_calsync_due_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+def remove_duplicate_rsvps(apps, schema_editor):
+    '''Keeps the first RSVP of each user for an event so the unique constraint can be added.'''
+    EventRSVP = apps.get_model('club', 'EventRSVP')
+    seen = set()
+    duplicate_ids = []
+    for rsvp_id, user_id, event_id in EventRSVP.objects.order_by('pk').values_list('pk', 'user_id', 'event_id'):
+        if (user_id, event_id) in seen:
+            duplicate_ids.append(rsvp_id)
+        else:
+            seen.add((user_id, event_id))
+    EventRSVP.objects.filter(pk__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0047_calendarsyncjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_rsvps, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventrsvp',
+            constraint=models.UniqueConstraint(fields=('user', 'event'), name='unique rsvp user-event'),
+        ),
+    ]
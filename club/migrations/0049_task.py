@@ -0,0 +1,49 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:35
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0048_eventrsvp_unique_user_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('D', 'Done'), ('F', 'Failed')], default='P', help_text='Pending jobs are picked up by the worker once run_after has passed.', max_length=1)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='How many times the job has been tried.')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='The job will not be tried before this time.')),
+                ('last_error', models.TextField(blank=True, help_text='The error from the last failed attempt.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('queue', models.CharField(help_text='The worker queue the task runs on, e.g. "mail".', max_length=50)),
+                ('name', models.CharField(help_text='The name of the task handler.', max_length=100)),
+                ('priority', models.PositiveSmallIntegerField(default=5, help_text='Tasks with lower numbers are run first.')),
+                ('payload', models.TextField(default='{}', help_text='JSON keyword arguments for the task handler.')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['queue', 'status', 'priority', 'run_after'], name='club_task_due_idx'),
+        ),
+        migrations.CreateModel(
+            name='DeadTask',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'dead letter',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('club.task',),
+        ),
+    ]
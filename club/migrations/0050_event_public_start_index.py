@@ -0,0 +1,17 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0049_task'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['hidden', 'event_type', 'start'], name='club_event_public_start_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0050_event_public_start_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start'], name='club_event_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end'], name='club_event_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faq',
+            index=models.Index(condition=models.Q(answer__isnull=False), fields=['id'], name='club_faq_answered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(condition=models.Q(verified=True), fields=['id'], name='club_member_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['tag_type', 'title'], name='club_tag_type_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='update',
+            index=models.Index(condition=models.Q(hidden=False), fields=['created_at'], name='club_update_public_created_idx'),
+        ),
+    ]
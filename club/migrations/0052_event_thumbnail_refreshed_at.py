@@ -0,0 +1,18 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0051_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='thumbnail_refreshed_at',
+            field=models.DateTimeField(blank=True, help_text='When the slideshow thumbnail link was last fetched from Google.', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0052_event_thumbnail_refreshed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='thumbnail_hash',
+            field=models.CharField(blank=True, help_text='Identifies the copies of the slideshow thumbnail saved in our own storage.', max_length=64, null=True),
+        ),
+    ]
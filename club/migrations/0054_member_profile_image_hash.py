@@ -0,0 +1,23 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0053_event_thumbnail_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='profile_image_hash',
+            field=models.CharField(blank=True, help_text='Identifies the resized copies of the uploaded profile image.', max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='member',
+            name='profile_image',
+            field=models.ImageField(blank=True, help_text='A profile image uploaded before images were processed. New uploads are stored as resized copies instead.', null=True, upload_to='profile-images'),
+        ),
+    ]
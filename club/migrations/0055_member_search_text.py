@@ -0,0 +1,44 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+def fill_search_text(apps, schema_editor):
+    '''Mirrors Member.build_search_text() for the existing members.'''
+    Member = apps.get_model('club', 'Member')
+    grades = dict(Member._meta.get_field('grade').choices)
+    for member in Member.objects.select_related('user').prefetch_related('tags'):
+        parts = [member.user.first_name, member.user.last_name, member.user.username, member.school_username, grades.get(member.grade)]
+        parts += [tag.title for tag in member.tags.all() if tag.tag_type == 'S']
+        member.search_text = ' '.join(part for part in parts if part).lower()
+        member.save(update_fields=['search_text'])
+
+
+def add_trigram_index(apps, schema_editor):
+    # Trigram indexes make LIKE '%term%' searches fast but only exist on PostgreSQL.
+    # Other databases scan the (small) verified members table instead.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute('CREATE INDEX club_member_search_trgm_idx ON club_member USING gin (search_text gin_trgm_ops)')
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS club_member_search_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0054_member_profile_image_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Lowercased name, usernames, grade and skills of the member that the members directory searches. Kept up to date by signals.'),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
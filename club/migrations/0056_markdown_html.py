@@ -0,0 +1,28 @@
+# Generated by Django 3.0.3 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0055_member_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The description rendered from Markdown when the event is saved.'),
+        ),
+        migrations.AddField(
+            model_name='eventagendaitem',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The description rendered from Markdown when the item is saved.'),
+        ),
+        migrations.AddField(
+            model_name='update',
+            name='body_html',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The body rendered from Markdown when the post is saved.'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.3 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0056_markdown_html'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='calendarsyncjob',
+            name='status',
+            field=models.CharField(choices=[('P', 'Pending'), ('R', 'Running'), ('D', 'Done'), ('F', 'Failed')], default='P', help_text='Pending jobs are picked up by the worker once run_after has passed.', max_length=1),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('P', 'Pending'), ('R', 'Running'), ('D', 'Done'), ('F', 'Failed')], default='P', help_text='Pending jobs are picked up by the worker once run_after has passed.', max_length=1),
+        ),
+    ]
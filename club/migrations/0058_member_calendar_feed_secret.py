@@ -0,0 +1,29 @@
+# Generated by Django 3.0.3 on 2026-10-18 17:02
+
+import club.models
+from django.db import migrations, models
+from uuid import uuid4
+
+
+def fill_calendar_feed_secrets(apps, schema_editor):
+    '''The default is only computed once for the existing members, so give each their own secret.'''
+    Member = apps.get_model('club', 'Member')
+    for member in Member.objects.only('pk'):
+        member.calendar_feed_secret = uuid4().hex
+        member.save(update_fields=['calendar_feed_secret'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0057_queuedjob_running_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='calendar_feed_secret',
+            field=models.CharField(default=club.models.new_calendar_feed_secret, editable=False, help_text="Part of the secret URL of the member's calendar feed. Resetting it stops the old URL from working.", max_length=32),
+        ),
+        migrations.RunPython(fill_calendar_feed_secrets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+'''
+Slack's legacy invite API, used to invite verified members to the club's workspace.
+Requests go through one pooled session so a batch of invites reuses its connections.
+'''
+from functools import lru_cache
+
+from django.conf import settings
+
+INVITE_URL = 'https://slack.com/api/users.admin.invite'
+
+# Seconds to wait for Slack before giving up on a request
+HTTP_TIMEOUT = 10
+
+# Errors that mean there is nothing left to do for the invite
+ALREADY_INVITED_ERRORS = {'already_invited', 'already_in_team', 'already_in_team_invited_user'}
+# Errors about the invited address itself, which retrying can't fix
+INVALID_INVITE_ERRORS = {'invalid_email', 'user_disabled'}
+
+class SlackRateLimited(Exception):
+    '''Slack answered 429 Too Many Requests. `retry_after` is how many seconds it asked us to wait.'''
+    def __init__(self, retry_after):
+        super().__init__(f'Rate limited by Slack for {retry_after} seconds')
+        self.retry_after = retry_after
+
+@lru_cache(maxsize=None)
+def get_session():
+    '''Builds the session on first use instead of on import.'''
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Only connection errors are retried here, a request that reached Slack is never sent twice
+    session.mount('https://', HTTPAdapter(max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)))
+    return session
+
+def invite(email):
+    '''Invites the email address to the workspace and returns Slack's JSON response.'''
+    response = get_session().post(INVITE_URL, data={
+        'email': email,
+        'token': settings.LEGACY_SLACK_TOKEN,
+    }, timeout=HTTP_TIMEOUT)
+    if response.status_code == 429:
+        raise SlackRateLimited(int(response.headers.get('Retry-After', 60)))
+    response.raise_for_status()
+    return response.json()
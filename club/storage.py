@@ -0,0 +1,24 @@
+'''
+Storage for uploaded files that aren't public (yet), such as profile images waiting to be
+resized, which may still carry EXIF data like GPS positions. They are kept out of the public
+bucket ACL and the long cache lifetime that the default storage gives published images.
+'''
+from django.conf import settings
+from django.core.files.storage import get_storage_class
+from django.utils.functional import LazyObject
+from storages.backends.gcloud import GoogleCloudStorage
+
+
+class PrivateGoogleCloudStorage(GoogleCloudStorage):
+    '''Objects only the project can read, under "private/" in the club bucket, that are never cached.'''
+    # Class attributes take precedence over the GS_* settings in every django-storages version
+    location = 'private'
+    default_acl = 'projectPrivate'
+    cache_control = 'private, no-store'
+
+
+class PrivateStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = get_storage_class(settings.PRIVATE_FILE_STORAGE)()
+
+private_storage = PrivateStorage()
@@ -0,0 +1,84 @@
+'''
+Handlers for background Tasks. Each handler is registered under the name its Task is
+queued with and is called with the task's payload as keyword arguments.
+'''
+from datetime import timedelta
+
+from django.utils import timezone
+
+from . import slack_api
+from .caching import bump_content_version
+from .email import send_bulk_email
+from .images import save_image_variants
+from .logger import logger
+from .storage import private_storage
+from .models import RetryTask, Task, Event, Member
+
+HANDLERS = {}
+
+def handler(name):
+    def register(func):
+        HANDLERS[name] = func
+        return func
+    return register
+
+@handler('send_email')
+def send_email(subject, plain_message, html_message, recipients):
+    '''Sends an already rendered email, retrying only the recipients that failed.'''
+    results = send_bulk_email(subject, plain_message, html_message, recipients)
+    failed = [recipient for recipient, error in results.items() if error]
+    if failed:
+        raise RetryTask(f'Failed to send to {len(failed)} recipient(s): {results[failed[0]]}', payload={
+            'subject': subject,
+            'plain_message': plain_message,
+            'html_message': html_message,
+            'recipients': failed
+        })
+
+@handler('resolve_event_thumbnail')
+def resolve_event_thumbnail(event_id):
+    '''Saves a thumbnail of the first slide of the event's slideshow.'''
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None or not event.slideshow_id:
+        return
+    event.get_thumbnail_link()
+    event.store_thumbnail()
+    # Updated directly so the save signals don't run again. The slideshow may have been
+    # changed while the thumbnail was being fetched, in which case this one is discarded.
+    Event.objects.filter(pk=event.pk, slideshow_id=event.slideshow_id).update(
+        thumbnail_link=event.thumbnail_link, thumbnail_hash=event.thumbnail_hash, thumbnail_refreshed_at=timezone.now())
+    bump_content_version()
+
+@handler('process_profile_image')
+def process_profile_image(member_id, upload_name):
+    '''Stores square, resized copies of an uploaded profile image without its EXIF data and deletes the upload.'''
+    with private_storage.open(upload_name) as upload:
+        data = upload.read()
+    try:
+        digest = save_image_variants(data, Member.PROFILE_IMAGE_PREFIX, Member.PROFILE_IMAGE_WIDTHS, square=True)
+    except OSError as e:
+        # Not an image Pillow can read, retrying won't help
+        logger.warning(f'Could not process profile image {upload_name} of member {member_id}: {e}')
+    else:
+        Member.objects.filter(pk=member_id).update(profile_image_hash=digest)
+        # Core team profile images are shown on the splash page
+        bump_content_version()
+    private_storage.delete(upload_name)
+
+@handler('invite_to_slack')
+def invite_to_slack(email):
+    '''Invites a verified member to the Slack workspace, backing off the whole queue when Slack rate limits us.'''
+    try:
+        result = slack_api.invite(email)
+    except slack_api.SlackRateLimited as e:
+        # Hold back the other pending invites too instead of letting each of them hit the limit
+        delay = timedelta(seconds=e.retry_after)
+        Task.pause_queue('slack', delay)
+        raise RetryTask(str(e), delay=delay, postpone=True)
+    error = result.get('error')
+    if result.get('ok') or error in slack_api.ALREADY_INVITED_ERRORS:
+        return
+    if error in slack_api.INVALID_INVITE_ERRORS:
+        logger.warning(f'Slack will not invite {email}: {error}')
+        return
+    raise RetryTask(f'Slack could not invite {email}: {error}')
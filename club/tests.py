@@ -1,3 +1,1171 @@
-from django.test import TestCase
+import hashlib
+import json
+import re
+import shutil
+import smtplib
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from django.contrib.auth.models import User
+from django.core import mail, signing
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.templatetags.static import static
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import empty
+
+from .email import queue_templated_email, send_bulk_email
+from .google_api import get_authorized_http, get_service, list_slideshows
+from .images import save_image_variants
+from .models import CalendarSyncJob, DeadTask, Event, EventAgendaItem, EventRSVP, EventAttendance, Member, Tag, Task, Update
+from .storage import PrivateGoogleCloudStorage, private_storage
+from .tasks import resolve_event_thumbnail
+
+
+def create_event(start, **kwargs):
+    fields = {
+        'event_type': 'IS',
+        'title': 'Info Session',
+        'description': 'Come learn about the club!',
+        'location': 'DCC 308',
+        'start': start,
+        'end': start + timedelta(hours=2)
+    }
+    fields.update(kwargs)
+    return Event.objects.create(**fields)
+
+
+# The manifest storage needs `collectstatic` to have been run
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class EventIndexQueryCountTests(TestCase):
+    '''The events page should make the same number of queries no matter how many events exist.'''
+
+    def setUp(self):
+        self.member = User.objects.create_user('member', 'member@example.com')
+        self.staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+
+    def create_events(self, count):
+        now = timezone.now()
+        for i in range(count):
+            upcoming = create_event(now + timedelta(days=i + 1))
+            past = create_event(now - timedelta(days=i + 2))
+            EventRSVP.objects.create(user=self.member, event=upcoming)
+            EventAttendance.objects.create(user=self.member, event=past)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/events/')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertQueryCountConstant(self):
+        self.create_events(2)
+        few_events = self.count_queries()
+        self.create_events(10)
+        many_events = self.count_queries()
+        self.assertEqual(few_events, many_events)
+
+    def test_anonymous(self):
+        self.assertQueryCountConstant()
+
+    def test_member(self):
+        self.client.force_login(self.member)
+        self.assertQueryCountConstant()
+
+    def test_staff(self):
+        self.client.force_login(self.staff)
+        self.assertQueryCountConstant()
+
+    def test_user_state_and_counts(self):
+        self.client.force_login(self.member)
+        self.create_events(1)
+        response = self.client.get('/events/')
+        upcoming = response.context['upcoming_events'][0]
+        past = response.context['past_events'][0]
+        self.assertTrue(upcoming.user_rsvped)
+        self.assertFalse(upcoming.user_attended)
+        self.assertTrue(past.user_attended)
+        # The core team is automatically RSVPed and marked as attending
+        self.assertEqual(upcoming.rsvp_count, 2)
+        self.assertEqual(upcoming.attendance_count, 1)
+        self.assertEqual(past.attendance_count, 2)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class PastEventPaginationTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.past_events = [create_event(now - timedelta(days=i + 2)) for i in range(25)]
+
+    def test_pages_cover_every_past_event_once(self):
+        response = self.client.get('/events/')
+        seen = [event.id for event in response.context['past_events']]
+        cursor = response.context['past_events_next']
+        while cursor:
+            page = self.client.get('/events/past', {'before': cursor}).json()
+            seen += [int(event_id) for event_id in re.findall(r'/events/(\d+)"', page['html'])]
+            cursor = page['next']
+        self.assertEqual(seen, [event.id for event in self.past_events])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/events/past', {'before': 'yesterday'}).status_code, 400)
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage')
+class ProfileImageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        # Make the storage pick up the overridden settings
+        default_storage._wrapped = empty
+        self.addCleanup(setattr, default_storage, '_wrapped', empty)
+        self.private_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.private_root)
+        private_storage._wrapped = FileSystemStorage(location=self.private_root)
+        self.addCleanup(setattr, private_storage, '_wrapped', empty)
+
+        self.user = User.objects.create_user('member', 'member@example.com')
+        self.client.force_login(self.user)
+
+    def upload(self, data):
+        return self.client.post('/account/', {
+            'first_name': 'Ada', 'last_name': 'Lovelace', 'school_username': 'lovela', 'grade': 'Fr',
+            'profile_image': SimpleUploadedFile('photo.jpg', data)
+        })
+
+    def image_data(self, size):
+        data = BytesIO()
+        exif = Image.Exif()
+        exif[0x010f] = 'Camera Maker'
+        Image.new('RGB', size, 'red').save(data, 'JPEG', exif=exif)
+        return data.getvalue()
+
+    def test_upload_is_resized_off_the_request(self):
+        self.upload(self.image_data((1200, 800)))
+        member = Member.objects.get(user=self.user)
+        self.assertIsNone(member.profile_image_hash)
+        task = Task.objects.get(queue='images', name='process_profile_image')
+        # The raw upload isn't public
+        self.assertFalse(default_storage.exists('profile-images'))
+        self.assertEqual(len(private_storage.listdir('profile-images')[1]), 1)
+
+        task.run()
+        member.refresh_from_db()
+        self.assertTrue(member.profile_image_hash)
+        for width in Member.PROFILE_IMAGE_WIDTHS:
+            for extension in ('jpg', 'webp'):
+                with default_storage.open(f'profile-images/{member.profile_image_hash}-{width}.{extension}') as variant:
+                    image = Image.open(variant)
+                    self.assertEqual(image.size, (width, width))
+                    self.assertFalse(image.getexif())
+        # The original upload is deleted once it has been processed
+        self.assertEqual(private_storage.listdir('profile-images')[1], [])
+        self.assertIn(member.profile_image_hash, member.profile_image_url)
+
+    def test_invalid_image_is_rejected(self):
+        self.upload(b'not an image')
+        self.assertFalse(Task.objects.filter(name='process_profile_image').exists())
+
+    def test_private_storage_ignores_public_bucket_settings(self):
+        # Builds the storage used in production instead of the file system storage above
+        with override_settings(GS_DEFAULT_ACL='publicRead', GS_CACHE_CONTROL='public, max-age=31536000, immutable'):
+            storage = PrivateGoogleCloudStorage()
+        self.assertEqual(storage.default_acl, 'projectPrivate')
+        self.assertEqual(storage.cache_control, 'private, no-store')
+        self.assertEqual(storage._normalize_name('profile-images/upload'), 'private/profile-images/upload')
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class MemberDirectoryTests(TestCase):
+    def setUp(self):
+        self.viewer = self.create_member('viewer', 'Grace', 'Hopper', 'Se')
+        self.client.force_login(self.viewer.user)
+        self.python = Tag.objects.create(tag_type='S', title='Python')
+
+    def create_member(self, username, first_name, last_name, grade):
+        user = User.objects.create_user(username, f'{username}@example.com', first_name=first_name, last_name=last_name)
+        member = Member.objects.create(user=user, verified=True, grade=grade, school_username=username)
+        return member
+
+    def get_members(self, **params):
+        response = self.client.get('/members/', params)
+        self.assertEqual(response.status_code, 200)
+        return [member.user.username for member in response.context['members']]
+
+    def test_query_count_is_constant(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self.client.get('/members/')
+            return len(context.captured_queries)
+
+        for i in range(2):
+            self.create_member(f'few{i}', 'Few', str(i), 'Fr')
+        few_members = count_queries()
+        for i in range(60):
+            self.create_member(f'many{i}', 'Many', str(i), 'Fr')
+        self.assertEqual(few_members, count_queries())
+
+    def test_search(self):
+        ada = self.create_member('lovela', 'Ada', 'Lovelace', 'Fr')
+        self.create_member('turina', 'Alan', 'Turing', 'G')
+        self.assertEqual(self.get_members(q='LOVE'), ['lovela'])
+        self.assertEqual(self.get_members(q='ada fresh'), ['lovela'])
+        self.assertEqual(self.get_members(grade='G'), ['turina'])
+
+        # Skills and name changes are picked up by the search text
+        ada.tags.add(self.python)
+        self.assertEqual(self.get_members(q='python'), ['lovela'])
+        self.assertEqual(self.get_members(skill=self.python.id), ['lovela'])
+        ada.user.last_name = 'Byron'
+        ada.user.save()
+        self.assertEqual(self.get_members(q='byron'), ['lovela'])
+
+    def tagged_member(self):
+        ada = self.create_member('lovela', 'Ada', 'Lovelace', 'Fr')
+        ada.tags.add(self.python)
+        self.assertIn('python', Member.objects.get(pk=ada.pk).search_text)
+        return ada
+
+    def test_clearing_a_tag_updates_search_text(self):
+        ada = self.tagged_member()
+        self.python.members.clear()
+        self.assertNotIn('python', Member.objects.get(pk=ada.pk).search_text)
+
+    def test_renaming_a_tag_updates_search_text(self):
+        ada = self.tagged_member()
+        self.python.title = 'Rust'
+        self.python.save()
+        search_text = Member.objects.get(pk=ada.pk).search_text
+        self.assertIn('rust', search_text)
+        self.assertNotIn('python', search_text)
+
+    def test_deleting_a_tag_updates_search_text(self):
+        ada = self.tagged_member()
+        self.python.delete()
+        self.assertNotIn('python', Member.objects.get(pk=ada.pk).search_text)
+
+
+class MemberSkillSearchTests(TestCase):
+    def setUp(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+        self.client.force_login(staff)
+        python = Tag.objects.create(tag_type='S', title='Python')
+        ml = Tag.objects.create(tag_type='S', title='ML')
+        for username, tags in [('both', [python, ml]), ('python', [python]), ('ml', [ml]), ('none', [])]:
+            user = User.objects.create_user(username, f'{username}@example.com')
+            Member.objects.create(user=user, verified=True).tags.set(tags)
+
+    def search(self, *skills, match='all'):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/members/skills', {'skill': skills, 'match': match})
+        member_queries = [query for query in context.captured_queries if 'club_member_tags' in query['sql']]
+        self.assertEqual(len(member_queries), 1)
+        return [member['email'] for member in response.json()['members']]
+
+    def test_all(self):
+        self.assertEqual(self.search('Python', 'ML'), ['both@example.com'])
+
+    def test_any(self):
+        emails = self.search('Python', 'ML', match='any')
+        self.assertEqual(emails[0], 'both@example.com')
+        self.assertCountEqual(emails, ['both@example.com', 'python@example.com', 'ml@example.com'])
+
+    def test_no_skills(self):
+        self.assertEqual(self.client.get('/members/skills').status_code, 400)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class InstrumentationTests(TestCase):
+    def test_server_timing_for_staff(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+        self.client.force_login(staff)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/events/')
+        match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries"', response['Server-Timing'])
+        self.assertEqual(int(match.group(1)), len(context.captured_queries))
+
+    def test_no_server_timing_for_visitors(self):
+        self.assertNotIn('Server-Timing', self.client.get('/events/'))
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event(timezone.now() + timedelta(days=1))
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_pages_are_cached_until_content_changes(self):
+        for path in ('/', '/events/'):
+            self.assertGreater(self.count_queries(path), 0)
+            self.assertEqual(self.count_queries(path), 0)
+
+        self.event.title = 'Study Jam'
+        self.event.save()
+        self.assertIn(b'Study Jam', self.client.get('/events/').content)
+
+        User.objects.create_user('staff', 'staff@example.com', first_name='Grace', is_staff=True)
+        self.assertIn(b'Grace', self.client.get('/').content)
+
+    def test_only_core_team_changes_invalidate_pages(self):
+        member = User.objects.create_user('member', 'member@example.com')
+        self.count_queries('/')
+        # Sign ups and profile edits of other members during busy times keep the pages cached
+        User.objects.create_user('new-member', 'new-member@example.com')
+        member.first_name = 'Ada'
+        member.save()
+        self.assertEqual(self.count_queries('/'), 0)
+
+        member.is_staff = True
+        member.save()
+        self.assertIn(b'Ada', self.client.get('/').content)
+        member = User.objects.get(pk=member.pk)
+        member.is_staff = False
+        member.save()
+        self.assertNotIn(b'Ada', self.client.get('/').content)
+
+    def test_only_read_query_params_are_in_the_key(self):
+        self.count_queries('/events/')
+        self.assertEqual(self.count_queries('/events/?utm_source=newsletter'), 0)
+        self.assertGreater(self.count_queries('/?x=12345'), 0)
+        self.assertEqual(self.count_queries('/?x=67890'), 0)
+        self.assertGreater(self.count_queries('/events/?past_before=garbage'), 0)
+
+    def test_members_are_not_served_cached_pages(self):
+        self.client.get('/events/')
+        self.client.force_login(User.objects.create_user('member', 'member@example.com'))
+        self.assertGreater(self.count_queries('/events/'), 0)
+
+
+class MarkdownTests(TestCase):
+    def test_rendered_on_save(self):
+        event = create_event(timezone.now(), description='**Bring** a laptop <script>alert(1)</script>')
+        self.assertIn('<strong>Bring</strong>', event.description_html)
+        self.assertNotIn('<script>', event.description_html)
+
+        event.description = '*Changed*'
+        event.save()
+        self.assertIn('<em>Changed</em>', Event.objects.get(pk=event.pk).description_html)
+
+    def test_backfill(self):
+        update = Update.objects.create(title='News', body='# Hello')
+        Update.objects.filter(pk=update.pk).update(body_html='')
+        call_command('render_markdown', stdout=StringIO())
+        update.refresh_from_db()
+        self.assertIn('<h1>Hello</h1>', update.body_html)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class MemberVerificationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+        self.client.force_login(staff)
+        self.members = []
+        for i in range(3):
+            user = User.objects.create_user(f'student{i}', f'student{i}@example.com')
+            self.members.append(Member.objects.create(user=user, school_username=f'student{i}'))
+
+    def test_bulk_verify(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.post('/core-team/member-management', {'verify-member-ids': [member.id for member in self.members]})
+        member_updates = [query for query in context.captured_queries if query['sql'].startswith('UPDATE "club_member"')]
+        self.assertEqual(len(member_updates), 1)
+        self.assertEqual(Member.objects.filter(verified=True).count(), 3)
+        self.assertEqual(Task.objects.filter(queue='slack', name='invite_to_slack').count(), 3)
+
+    def test_pending_invites_are_not_queued_twice(self):
+        self.members[0].verify()
+        self.members[0].save()
+        Member.objects.filter(pk=self.members[0].pk).update(verified=False)
+        self.members[0].verified = False
+        Member.verify_many(self.members)
+        self.assertEqual(Task.objects.filter(queue='slack', name='invite_to_slack').count(), 3)
+
+    def test_invalid_email_is_not_retried(self):
+        Member.verify_many(self.members[:1])
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'ok': False, 'error': 'invalid_email'}
+        with mock.patch('club.slack_api.get_session') as get_session:
+            get_session.return_value.post.return_value = response
+            Task.process_queue('slack')
+        self.assertEqual(Task.objects.get(queue='slack').status, 'D')
+
+    def test_rate_limit_postpones_pending_invites(self):
+        Member.verify_many(self.members)
+        response = mock.Mock(status_code=429, headers={'Retry-After': '120'})
+        with mock.patch('club.slack_api.get_session') as get_session:
+            get_session.return_value.post.return_value = response
+            Task.process_queue('slack', limit=1)
+            # The other invites wait for the rate limit too
+            self.assertEqual(Task.process_queue('slack'), 0)
+        self.assertEqual(get_session.return_value.post.call_count, 1)
+        self.assertTrue(Task.is_paused('slack'))
+        postponed = Task.objects.get(queue='slack', run_after__gt=timezone.now() + timedelta(seconds=100))
+        # Waiting for the rate limit doesn't use up attempts
+        self.assertEqual((postponed.status, postponed.attempts), ('P', 0))
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class EventDetailQueryBudgetTests(TestCase):
+    '''event_detail should make a small, fixed number of queries however many RSVPs, attendees and agenda items an event has.'''
+
+    # Including the session, user and (for the core team) group queries of the page around it
+    QUERY_BUDGET = {'anonymous': 2, 'member': 4, 'staff': 7}
+
+    def setUp(self):
+        self.event = create_event(timezone.now() - timedelta(hours=1))
+        self.member = User.objects.create_user('member', 'member@example.com')
+        Member.objects.create(user=self.member, verified=True)
+        self.staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+        Member.objects.create(user=self.staff, verified=True)
+        self.attendee_count = 0
+
+    def add_attendees(self, count):
+        for i in range(count):
+            self.attendee_count += 1
+            user = User.objects.create_user(f'attendee{self.attendee_count}', f'attendee{self.attendee_count}@example.com')
+            Member.objects.create(user=user, verified=True)
+            EventRSVP.objects.create(user=user, event=self.event, message='If I finish my homework')
+            EventAttendance.objects.create(user=user, event=self.event)
+            EventAgendaItem.objects.create(event=self.event, title=f'Talk {self.attendee_count}',
+                estimated_start_time='18:00', estimated_duration=timedelta(minutes=10))
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/events/{self.event.id}')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertWithinBudget(self, visitor):
+        self.add_attendees(1)
+        few = self.count_queries()
+        self.add_attendees(10)
+        many = self.count_queries()
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, self.QUERY_BUDGET[visitor])
+
+    def test_anonymous(self):
+        self.assertWithinBudget('anonymous')
+
+    def test_member(self):
+        self.client.force_login(self.member)
+        self.assertWithinBudget('member')
+
+    def test_staff(self):
+        self.client.force_login(self.staff)
+        self.assertWithinBudget('staff')
+
+    def test_user_state(self):
+        EventRSVP.objects.create(user=self.member, event=self.event, message='Bringing a friend')
+        EventAttendance.objects.create(user=self.member, event=self.event)
+        self.client.force_login(self.member)
+        response = self.client.get(f'/events/{self.event.id}')
+        self.assertEqual(response.context['rsvp'].message, 'Bringing a friend')
+        self.assertTrue(response.context['attendance_submitted'])
+        self.assertFalse(response.context['feedback_submitted'])
+
+
+class CheckInTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.event = create_event(now - timedelta(hours=1), end=now + timedelta(hours=1), attendance_code='ABCDEF')
+        self.user = User.objects.create_user('member', 'member@example.com')
+        Member.objects.create(user=self.user, verified=True)
+        self.client.force_login(self.user)
+
+    def check_in(self, code='abcdef'):
+        return self.client.post(f'/events/{self.event.id}/check-in', {'attendance-code': code})
+
+    def test_check_in_is_idempotent(self):
+        self.check_in()
+        with CaptureQueriesContext(connection) as context:
+            response = self.check_in()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(EventAttendance.objects.filter(event=self.event, user=self.user).count(), 1)
+        # Session, user, member check and the insert; the event itself comes from the cache
+        self.assertEqual(len(context.captured_queries), 4)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_session_saves_a_query(self):
+        # Production reads sessions from Redis
+        self.client.force_login(self.user)
+        self.check_in()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.check_in().status_code, 200)
+        self.assertEqual(len(context.captured_queries), 3)
+
+    def test_wrong_code(self):
+        self.assertEqual(self.check_in('ZZZZZZ').status_code, 400)
+        self.assertFalse(EventAttendance.objects.filter(event=self.event, user=self.user).exists())
+
+    def test_code_change_is_picked_up(self):
+        self.check_in('ZZZZZZ')
+        self.event.attendance_code = 'ZZZZZZ'
+        self.event.save()
+        self.assertEqual(self.check_in('ZZZZZZ').status_code, 200)
+
+    def test_outside_of_event(self):
+        self.event.end = timezone.now() - timedelta(minutes=1)
+        self.event.save()
+        self.assertEqual(self.check_in().status_code, 400)
+
+    def test_unverified_member(self):
+        Member.objects.filter(user=self.user).update(verified=False)
+        self.assertEqual(self.check_in().status_code, 403)
+
+
+class BulkCheckInTests(TestCase):
+    def setUp(self):
+        self.event = create_event(timezone.now() - timedelta(hours=1))
+        self.staff = User.objects.create_user('staff', 'staff@example.com', is_staff=True)
+        self.members = [User.objects.create_user(f'member{i}', f'member{i}@example.com', first_name=f'Member{i}') for i in range(3)]
+        Member.objects.bulk_create([Member(user=self.staff)] + [Member(user=user, verified=True) for user in self.members])
+        self.client.force_login(self.staff)
+
+    def bulk_check_in(self, tokens):
+        return self.client.post(f'/events/{self.event.id}/kiosk/check-in', json.dumps({'tokens': tokens}), content_type='application/json')
+
+    def test_statuses(self):
+        unverified = User.objects.create_user('unverified', 'unverified@example.com')
+        Member.objects.create(user=unverified)
+        self.event.attendance.create(user=self.members[0])
+        tokens = [user.member.check_in_token for user in self.members] + [self.members[1].member.check_in_token, 'forged', unverified.member.check_in_token]
+
+        response = self.bulk_check_in(tokens)
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.json()['results']]
+        self.assertEqual(statuses, ['already_checked_in', 'checked_in', 'checked_in', 'already_checked_in', 'invalid_token', 'not_a_member'])
+        self.assertEqual(response.json()['results'][1]['name'], 'Member1')
+        self.assertEqual(set(self.event.attendance.values_list('user_id', flat=True)), {user.id for user in self.members})
+
+    def test_query_count_is_constant(self):
+        more = [User.objects.create_user(f'extra{i}', f'extra{i}@example.com') for i in range(20)]
+        Member.objects.bulk_create([Member(user=user, verified=True) for user in more])
+        with CaptureQueriesContext(connection) as small:
+            self.bulk_check_in([self.members[0].member.check_in_token])
+        with CaptureQueriesContext(connection) as large:
+            self.bulk_check_in([user.member.check_in_token for user in more])
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_staff_only(self):
+        self.client.force_login(self.members[0])
+        response = self.bulk_check_in([self.members[0].member.check_in_token])
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(self.event.attendance.exists())
+
+    def test_invalid_body(self):
+        self.assertEqual(self.client.post(f'/events/{self.event.id}/kiosk/check-in', 'nope', content_type='application/json').status_code, 400)
+        self.assertEqual(self.bulk_check_in(['token'] * 201).status_code, 400)
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event(timezone.now() + timedelta(days=1), title='Intro to Cloud, Part 1', description='Bring a laptop; ' + 'long text ' * 20)
+        create_event(timezone.now() + timedelta(days=2), title='Secret', hidden=True)
+
+    def test_feed(self):
+        response = self.client.get('/events.ics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        content = response.content.decode()
+        self.assertIn('SUMMARY:Intro to Cloud\\, Part 1: Info Session\r\n', content)
+        self.assertNotIn('Secret', content)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in content.split('\r\n')))
+
+    def test_not_modified(self):
+        response = self.client.get('/events.ics')
+        with CaptureQueriesContext(connection) as context:
+            cached = self.client.get('/events.ics', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 1)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.client.get('/events.ics').status_code, 200)
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_changes_invalidate_feed(self):
+        etag = self.client.get('/events.ics')['ETag']
+        self.event.title = 'Renamed'
+        self.event.save()
+        response = self.client.get('/events.ics', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('SUMMARY:Renamed', response.content.decode())
+
+        self.event.delete()
+        self.assertNotEqual(self.client.get('/events.ics', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class MemberCalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.event = create_event(now + timedelta(days=1), title='Workshop')
+        self.other_event = create_event(now + timedelta(days=2), title='Hackathon')
+        self.user = User.objects.create_user('member', 'member@example.com')
+        self.member = Member.objects.create(user=self.user, verified=True)
+        EventRSVP.objects.create(user=self.user, event=self.event)
+        self.url = f'/events/rsvps/{self.member.calendar_feed_token}.ics'
+
+    def get_feed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_feed(self):
+        content = self.get_feed()
+        self.assertIn('SUMMARY:Workshop', content)
+        self.assertNotIn('Hackathon', content)
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get(f'/events/rsvps/{self.user.id}:forged.ics').status_code, 404)
+
+    def test_cached_feed_makes_no_queries(self):
+        self.get_feed()
+        # Changes to other members' RSVPs keep the feed cached
+        other = User.objects.create_user('other', 'other@example.com')
+        EventRSVP.objects.create(user=other, event=self.other_event)
+        with CaptureQueriesContext(connection) as context:
+            self.get_feed()
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_rsvp_changes_invalidate_feed(self):
+        self.get_feed()
+        EventRSVP.objects.create(user=self.user, event=self.other_event)
+        self.assertIn('Hackathon', self.get_feed())
+        EventRSVP.objects.filter(user=self.user, event=self.event).delete()
+        self.assertNotIn('Workshop', self.get_feed())
+
+    def test_token_without_secret_is_rejected(self):
+        token = signing.Signer(salt=Member.CALENDAR_FEED_TOKEN_SALT).sign(str(self.user.id))
+        self.assertEqual(self.client.get(f'/events/rsvps/{token}.ics').status_code, 404)
+
+    def test_reset_link(self):
+        self.get_feed()
+        self.client.force_login(self.user)
+        response = self.client.post('/account/', {'reset-calendar-feed': '1'})
+        self.assertRedirects(response, '/account/', fetch_redirect_response=False)
+        self.client.logout()
+
+        # The old link stops working even though its feed was cached
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.member.refresh_from_db()
+        self.url = f'/events/rsvps/{self.member.calendar_feed_token}.ics'
+        self.assertIn('SUMMARY:Workshop', self.get_feed())
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_reset_needs_a_post(self):
+        # A link or image on another site must not be able to break the member's feed
+        secret = self.member.calendar_feed_secret
+        self.client.force_login(self.user)
+        self.client.get('/account/?reset-calendar-feed=1')
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.calendar_feed_secret, secret)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_event_changes_invalidate_feed(self):
+        self.get_feed()
+        self.event.title = 'Renamed Workshop'
+        self.event.save()
+        self.assertIn('SUMMARY:Renamed Workshop', self.get_feed())
+        self.event.delete()
+        self.assertNotIn('Renamed Workshop', self.get_feed())
+
+
+class FakeCalendarService:
+    '''Records Calendar API calls instead of sending them. The first `failures` calls raise an error.'''
+    def __init__(self, failures=0, on_execute=None):
+        self.calls = []
+        self.failures = failures
+        self.on_execute = on_execute
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body):
+        self.calls.append(('insert', body['summary']))
+        return self
+
+    def patch(self, calendarId, eventId, body):
+        self.calls.append(('patch', eventId, body['summary']))
+        return self
+
+    def delete(self, calendarId, eventId):
+        self.calls.append(('delete', eventId))
+        return self
+
+    def execute(self):
+        if self.on_execute:
+            self.on_execute()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('Calendar is unavailable')
+        return {'id': f'calendar-{len(self.calls)}'}
+
+
+class CalendarSyncTests(TestCase):
+    def setUp(self):
+        self.event = create_event(timezone.now() + timedelta(days=1))
+
+    def sync(self, service):
+        return CalendarSyncJob.process_due(service=service)
+
+    def test_saves_are_coalesced(self):
+        self.event.title = 'Study Jam'
+        self.event.save()
+        self.assertEqual(CalendarSyncJob.objects.filter(status='P').count(), 1)
+
+        service = FakeCalendarService()
+        self.assertEqual(self.sync(service), 1)
+        self.assertEqual(service.calls, [('insert', 'Study Jam: Info Session')])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.calendar_event_id, 'calendar-1')
+
+    def test_save_while_syncing_is_not_lost(self):
+        def edit_during_sync():
+            if not service.calls[1:]:
+                Event.objects.get(pk=self.event.pk).save()
+                Event.objects.filter(pk=self.event.pk).update(title='Renamed')
+        service = FakeCalendarService(on_execute=edit_during_sync)
+        self.assertEqual(self.sync(service), 1)
+        # The worker picks up the sync queued during the first one when it next polls
+        self.assertEqual(self.sync(service), 1)
+        self.assertEqual(service.calls, [('insert', 'Info Session: Info Session'), ('patch', 'calendar-1', 'Renamed: Info Session')])
+
+    def test_failures_are_retried_with_backoff(self):
+        self.assertEqual(self.sync(FakeCalendarService(failures=1)), 1)
+        job = CalendarSyncJob.objects.get()
+        self.assertEqual((job.status, job.attempts, job.last_error), ('P', 1, 'Calendar is unavailable'))
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), CalendarSyncJob.BACKOFF_BASE, delta=5)
+        # Not due again until the backoff has passed
+        self.assertEqual(self.sync(FakeCalendarService()), 0)
+
+        CalendarSyncJob.objects.update(run_after=timezone.now(), attempts=CalendarSyncJob.MAX_ATTEMPTS - 1)
+        self.sync(FakeCalendarService(failures=1))
+        self.assertEqual(CalendarSyncJob.objects.get().status, 'F')
+
+    def test_abandoned_claims_are_retried(self):
+        job = CalendarSyncJob.claim(CalendarSyncJob.due())
+        self.assertEqual(self.sync(FakeCalendarService()), 0)
+        CalendarSyncJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertEqual(self.sync(FakeCalendarService()), 1)
+
+    def test_syncs_of_an_event_run_one_at_a_time(self):
+        running = CalendarSyncJob.claim(CalendarSyncJob.due())
+        self.event.save()
+        create_event(timezone.now() + timedelta(days=2), title='Hackathon')
+
+        # Only the other event is synced while another worker syncs the first one
+        service = FakeCalendarService()
+        self.assertEqual(self.sync(service), 1)
+        self.assertEqual(service.calls, [('insert', 'Hackathon: Info Session')])
+
+        running.mark_done()
+        self.assertEqual(self.sync(service), 1)
+
+    def test_deleted_event(self):
+        self.sync(FakeCalendarService())
+        self.event.refresh_from_db()
+        self.event.delete()
+
+        service = FakeCalendarService()
+        self.sync(service)
+        self.assertEqual(service.calls, [('delete', 'calendar-1')])
+        self.assertFalse(CalendarSyncJob.objects.exclude(status='D').exists())
+
+    def test_hidden_event_is_removed(self):
+        self.sync(FakeCalendarService())
+        self.event.refresh_from_db()
+        self.event.hidden = True
+        self.event.save()
+
+        service = FakeCalendarService()
+        self.sync(service)
+        self.assertEqual(service.calls, [('delete', 'calendar-1')])
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.calendar_event_id)
+
+
+class TaskQueueTests(TestCase):
+    def test_database_errors_are_recorded(self):
+        def create_duplicate_users():
+            User.objects.create_user('duplicate')
+            User.objects.create_user('duplicate')
+
+        task = Task.enqueue('google', 'broken')
+        with mock.patch.dict('club.tasks.HANDLERS', {'broken': create_duplicate_users}):
+            self.assertEqual(Task.process_queue('google'), 1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('P', 1))
+        self.assertTrue(task.last_error)
+        # The handler's changes are rolled back
+        self.assertFalse(User.objects.filter(username='duplicate').exists())
+
+
+@override_settings(EMAIL_BATCH_SIZE=2)
+class MailQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('member', 'member@example.com', first_name='Ada')
+        # Creating the user queues the welcome email
+        Task.objects.all().delete()
+
+    def queue(self, subject, recipients, priority=None):
+        return queue_templated_email(subject, 'verification_code', {'user': self.user, 'verification_code': 'abcdef'}, recipients, priority=priority)
+
+    def test_recipients_are_split_into_tasks(self):
+        self.queue('Newsletter', [f'member{i}@example.com' for i in range(5)])
+        tasks = Task.objects.filter(queue='mail').order_by('pk')
+        self.assertEqual([len(task.data['recipients']) for task in tasks], [2, 2, 1])
+
+        self.assertEqual(Task.process_queue('mail'), 3)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_urgent_email_overtakes_newsletter(self):
+        self.queue('Newsletter', [f'member{i}@example.com' for i in range(5)], priority=Task.PRIORITY_LOW)
+        self.queue('Verify School Account', ['ada@example.edu'], priority=Task.PRIORITY_HIGH)
+        Task.process_queue('mail', limit=1)
+        self.assertEqual([message.subject for message in mail.outbox], ['Verify School Account'])
+
+    def test_only_failed_recipients_are_retried(self):
+        self.queue('Newsletter', ['sent@example.com', 'refused@example.com'])
+        with mock.patch('club.tasks.send_bulk_email', return_value={'sent@example.com': None, 'refused@example.com': 'Recipient refused'}):
+            Task.process_queue('mail')
+        task = Task.objects.get(queue='mail')
+        self.assertEqual((task.status, task.attempts), ('P', 1))
+        self.assertEqual(task.data['recipients'], ['refused@example.com'])
+        self.assertGreater(task.run_after, timezone.now())
+
+    def test_dead_letter(self):
+        self.queue('Newsletter', ['refused@example.com'])
+        Task.objects.update(attempts=Task.MAX_ATTEMPTS - 1)
+        with mock.patch('club.tasks.send_bulk_email', return_value={'refused@example.com': 'Recipient refused'}):
+            Task.process_queue('mail')
+        self.assertEqual(list(DeadTask.objects.filter(status='F').values_list('name', flat=True)), ['send_email'])
+        self.assertFalse(Task.due('mail').exists())
+
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    '''Refuses refused@example.com and drops the connection once when sending to dropped@example.com.'''
+    opened = 0
+    dropped = False
+
+    def open(self):
+        FlakyEmailBackend.opened += 1
+
+    def send_messages(self, messages):
+        recipient = messages[0].to[0]
+        if recipient == 'refused@example.com':
+            raise smtplib.SMTPRecipientsRefused({recipient: (550, b'No such user')})
+        if recipient == 'dropped@example.com' and not FlakyEmailBackend.dropped:
+            FlakyEmailBackend.dropped = True
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='club.tests.FlakyEmailBackend', EMAIL_SEND_WORKERS=1)
+class EmailSendingTests(TestCase):
+    def setUp(self):
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.dropped = False
+
+    def test_chunks_reuse_connections(self):
+        results = send_bulk_email('Hello', 'Hi', '<p>Hi</p>', [f'member{i}@example.com' for i in range(5)], chunk_size=2)
+        self.assertEqual(list(results.values()), [None] * 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(FlakyEmailBackend.opened, 3)
+
+    def test_partial_failure(self):
+        recipients = ['first@example.com', 'refused@example.com', 'last@example.com']
+        results = send_bulk_email('Hello', 'Hi', '<p>Hi</p>', recipients)
+        self.assertIsNone(results['first@example.com'])
+        self.assertIn('No such user', results['refused@example.com'])
+        self.assertEqual([message.to for message in mail.outbox], [['first@example.com'], ['last@example.com']])
+
+    def test_reconnects_when_connection_drops(self):
+        recipients = ['first@example.com', 'dropped@example.com', 'last@example.com']
+        results = send_bulk_email('Hello', 'Hi', '<p>Hi</p>', recipients)
+        self.assertEqual(list(results.values()), [None] * 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(FlakyEmailBackend.opened, 2)
+
+
+class EnrollUsersTests(TestCase):
+    def setUp(self):
+        self.event = create_event(timezone.now() + timedelta(days=1))
+
+    def enroll(self, users):
+        with CaptureQueriesContext(connection) as context:
+            self.event.enroll_users(users)
+        return len(context.captured_queries)
+
+    def test_enrolling_is_idempotent_and_batched(self):
+        users = [User.objects.create_user(f'user{i}') for i in range(30)]
+        # The user IDs, one INSERT for the RSVPs and one for the attendance
+        self.assertEqual(self.enroll(User.objects.filter(username__in=['user0', 'user1'])), 3)
+        self.assertEqual(self.enroll(User.objects.filter(username__startswith='user')), 3)
+        self.assertEqual(self.enroll(users), 2)
+        self.assertEqual(self.event.rsvps.count(), 30)
+        self.assertEqual(self.event.attendance.count(), 30)
+
+
+class RSVPDedupeMigrationTests(TransactionTestCase):
+    '''Migration 0048 removes duplicate RSVPs before adding the unique constraint.'''
+    migrate_from = [('club', '0047_calendarsyncjob')]
+    migrate_to = [('club', '0048_eventrsvp_unique_user_event')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        self.latest = MigrationExecutor(connection).loader.graph.leaf_nodes('club')
+        self.addCleanup(self.migrate, self.latest)
+
+    def test_keeps_one_rsvp_per_user_and_event(self):
+        apps = self.migrate(self.migrate_from)
+        User = apps.get_model('auth', 'User')
+        Event = apps.get_model('club', 'Event')
+        EventRSVP = apps.get_model('club', 'EventRSVP')
+        ada = User.objects.create(username='ada')
+        alan = User.objects.create(username='alan')
+        now = timezone.now()
+        event = Event.objects.create(event_type='IS', title='Info Session', description='', location='DCC 308', start=now, end=now)
+        first = EventRSVP.objects.create(user=ada, event=event)
+        EventRSVP.objects.create(user=ada, event=event)
+        EventRSVP.objects.create(user=ada, event=event)
+        other = EventRSVP.objects.create(user=alan, event=event)
+
+        apps = self.migrate(self.migrate_to)
+        rsvps = apps.get_model('club', 'EventRSVP').objects.order_by('pk').values_list('pk', flat=True)
+        self.assertEqual(list(rsvps), [first.pk, other.pk])
+
+
+def image_bytes(size, image_format='PNG'):
+    data = BytesIO()
+    Image.new('RGB', size, 'blue').save(data, image_format)
+    return data.getvalue()
+
+
+class FakeSlidesService:
+    '''Answers the Slides API calls used for thumbnails and records them.'''
+    def __init__(self):
+        self.calls = []
+        self.response = None
+
+    def presentations(self):
+        return self
+
+    def pages(self):
+        return self
+
+    def get(self, presentationId, fields):
+        self.calls.append(('get', presentationId, fields))
+        self.response = {'slides': [{'objectId': 'first-slide'}, {'objectId': 'second-slide'}]}
+        return self
+
+    def getThumbnail(self, presentationId, pageObjectId, thumbnailProperties_thumbnailSize):
+        self.calls.append(('getThumbnail', presentationId, pageObjectId))
+        self.response = {'contentUrl': f'https://lh3.googleusercontent.com/{presentationId}'}
+        return self
+
+    def execute(self):
+        return self.response
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage')
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_URL='/media/')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        default_storage._wrapped = empty
+        self.addCleanup(setattr, default_storage, '_wrapped', empty)
+
+    def test_variants_are_named_by_content(self):
+        data = image_bytes((600, 300))
+        digest = save_image_variants(data, 'test', [128, 256, 1024])
+        self.assertEqual(digest, hashlib.sha256(data).hexdigest()[:32])
+        for width, size in [(128, (128, 64)), (256, (256, 128)), (1024, (600, 300))]:
+            for extension in ('jpg', 'webp'):
+                with default_storage.open(f'test/{digest}-{width}.{extension}') as variant:
+                    self.assertEqual(Image.open(variant).size, size)
+
+        # Variants that exist already are not saved again
+        with mock.patch.object(default_storage, 'save') as save:
+            self.assertEqual(save_image_variants(data, 'test', [128, 256, 1024]), digest)
+        save.assert_not_called()
+
+    def test_not_an_image(self):
+        with self.assertRaises(OSError):
+            save_image_variants(b'not an image', 'test', [128])
+
+    def test_member_image_fallbacks(self):
+        member = Member(user=User(username='ada'))
+        self.assertEqual(member.profile_image_url, static('club/img/profile-placeholder.png'))
+        self.assertIsNone(member.profile_image_srcset)
+
+        member.profile_image_hash = 'abc'
+        self.assertEqual(member.profile_image_url, f'/media/{Member.PROFILE_IMAGE_PREFIX}/abc-256.jpg')
+        self.assertIn(f'/media/{Member.PROFILE_IMAGE_PREFIX}/abc-128.webp 128w', member.profile_image_webp_srcset)
+
+    def test_event_thumbnail_fallbacks(self):
+        event = Event(thumbnail_link='https://example.com/thumbnail.png')
+        self.assertEqual(event.thumbnail_url, 'https://example.com/thumbnail.png')
+        self.assertIsNone(event.thumbnail_srcset)
+
+        event.thumbnail_hash = 'abc'
+        self.assertEqual(event.thumbnail_url, f'/media/{Event.THUMBNAIL_PREFIX}/abc-256.jpg')
+        self.assertEqual(event.thumbnail_srcset, f'/media/{Event.THUMBNAIL_PREFIX}/abc-128.jpg 128w, /media/{Event.THUMBNAIL_PREFIX}/abc-256.jpg 256w')
+
+    def test_resolve_event_thumbnail(self):
+        first = create_event(timezone.now(), slideshow_id='deck')
+        second = create_event(timezone.now(), slideshow_id='deck')
+        slides = FakeSlidesService()
+        download = mock.Mock(content=image_bytes((800, 450), 'JPEG'))
+        with mock.patch('club.models.slides_service', slides), mock.patch('club.models.requests.get', return_value=download) as get:
+            resolve_event_thumbnail(first.pk)
+            resolve_event_thumbnail(second.pk)
+
+        # Only the slide IDs are requested and the link is reused for the second event
+        self.assertEqual(slides.calls, [('get', 'deck', 'slides/objectId'), ('getThumbnail', 'deck', 'first-slide')])
+        get.assert_called_with('https://lh3.googleusercontent.com/deck', timeout=30)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.thumbnail_link, 'https://lh3.googleusercontent.com/deck')
+        self.assertTrue(first.thumbnail_hash)
+        self.assertEqual(first.thumbnail_hash, second.thumbnail_hash)
+        self.assertTrue(default_storage.exists(f'{Event.THUMBNAIL_PREFIX}/{first.thumbnail_hash}-256.webp'))
+
+
+class RefreshThumbnailsTests(TestCase):
+    def setUp(self):
+        self.event = create_event(timezone.now(), slideshow_id='deleted-deck', thumbnail_link='https://lh3.googleusercontent.com/expired')
+        # The slideshow was deleted, so the event's task failed until it was given up on
+        Task.enqueue('google', 'resolve_event_thumbnail', event_id=self.event.pk)
+        Task.objects.update(status='F', attempts=Task.MAX_ATTEMPTS)
+
+    def refresh(self):
+        call_command('refresh_thumbnails', stdout=StringIO())
+        return Task.objects.filter(name='resolve_event_thumbnail', status='P').count()
+
+    def test_failed_thumbnails_are_not_queued_again(self):
+        self.assertEqual(self.refresh(), 0)
+
+    def test_changed_event_is_tried_again(self):
+        self.event.title = 'New Deck'
+        self.event.save()
+        self.assertEqual(self.refresh(), 1)
+
+
+class FakeDriveService:
+    '''Answers Drive file listings with the given pages and records the page tokens requested.'''
+    def __init__(self, pages):
+        self.pages = pages
+        self.page_tokens = []
+
+    def files(self):
+        return self
+
+    def list(self, pageToken=None, **kwargs):
+        self.page_tokens.append(pageToken)
+        self.page = int(pageToken.split('-')[1]) if pageToken else 0
+        return self
+
+    def execute(self):
+        response = {'files': self.pages[self.page]}
+        if self.page + 1 < len(self.pages):
+            response['nextPageToken'] = f'page-{self.page + 1}'
+        return response
+
+
+class SlideshowCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = FakeDriveService([[{'id': 'a', 'name': 'Intro'}], [{'id': 'b', 'name': 'Workshop'}]])
+        patcher = mock.patch('club.google_api.drive_service', self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages_are_followed(self):
+        self.assertEqual(list_slideshows(), [{'id': 'a', 'name': 'Intro'}, {'id': 'b', 'name': 'Workshop'}])
+        self.assertEqual(self.service.page_tokens, [None, 'page-1'])
+
+    def test_catalog_is_cached(self):
+        list_slideshows()
+        self.assertEqual(len(list_slideshows()), 2)
+        self.assertEqual(len(self.service.page_tokens), 2)
+
+    def test_refresh_bypasses_the_cache(self):
+        list_slideshows()
+        self.service.pages[1].append({'id': 'c', 'name': 'Hackathon'})
+        self.assertEqual(len(list_slideshows(refresh=True)), 3)
+        self.assertEqual(self.service.page_tokens, [None, 'page-1', None, 'page-1'])
+        # The refreshed catalog replaces the cached one
+        self.assertEqual(len(list_slideshows()), 3)
+
+
+class GoogleServiceThreadingTests(TestCase):
+    def setUp(self):
+        # Builds stand-ins instead of clients that would talk to Google
+        patchers = [
+            mock.patch('club.google_api.get_discovery_doc', return_value='{}'),
+            mock.patch('google_auth_httplib2.AuthorizedHttp', side_effect=lambda credentials, http: mock.Mock()),
+            mock.patch('googleapiclient.discovery.build_from_document', side_effect=lambda document, http: mock.Mock(http=http))
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def clients_in_new_thread(self):
+        clients = {}
+
+        def build():
+            clients['drive'] = get_service('drive', 'v3')
+            clients['drive_again'] = get_service('drive', 'v3')
+            clients['calendar'] = get_service('calendar', 'v3')
+            clients['http'] = get_authorized_http()
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+        return clients
+
+    def test_each_thread_has_its_own_clients(self):
+        first = self.clients_in_new_thread()
+        second = self.clients_in_new_thread()
+        # A thread reuses its clients and their transport for all of its requests
+        self.assertIs(first['drive'], first['drive_again'])
+        self.assertIs(first['drive'].http, first['http'])
+        self.assertIs(first['calendar'].http, first['http'])
+        # httplib2 isn't thread-safe, so no other thread shares them
+        self.assertIsNot(first['drive'], second['drive'])
+        self.assertIsNot(first['http'], second['http'])
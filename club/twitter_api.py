@@ -1,10 +1,14 @@
-import twitter
 import os
+from functools import lru_cache
 
-twitter_api = twitter.Api(consumer_key=os.environ['TWITTER_CONSUMER_API_KEY'],
-    consumer_secret=os.environ['TWITTER_CONSUMER_API_SECRET_KEY'],
-    access_token_key=os.environ['TWITTER_ACCESS_TOKEN'],
-    access_token_secret=os.environ['TWITTER_ACCESS_TOKEN_SECRET'])
+@lru_cache(maxsize=None)
+def get_twitter_api():
+    '''Builds the Twitter client on first use instead of on import.'''
+    import twitter
+    return twitter.Api(consumer_key=os.environ['TWITTER_CONSUMER_API_KEY'],
+        consumer_secret=os.environ['TWITTER_CONSUMER_API_SECRET_KEY'],
+        access_token_key=os.environ['TWITTER_ACCESS_TOKEN'],
+        access_token_secret=os.environ['TWITTER_ACCESS_TOKEN_SECRET'])
 
 def tweet(message):
-    return twitter_api.PostUpdate(message)
\ No newline at end of file
+    return get_twitter_api().PostUpdate(message)
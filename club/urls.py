@@ -7,6 +7,9 @@ urlpatterns = [
     path('faq', views.faq, name='faq'),
     path('conduct', views.conduct, name='conduct'),
     path('events/', views.event_index, name='events'),
+    path('events/past', views.event_past_index, name='event_past_index'),
+    path('events.ics', views.event_calendar_feed, name='event_calendar_feed'),
+    path('events/rsvps/<str:token>.ics', views.member_calendar_feed, name='member_calendar_feed'),
     path('projects/', views.project_index, name='projects'),
     path('updates/', views.update_index, name='updates'),
     path('updates/<int:update_id>', views.update_detail, name='update_detail'),
@@ -14,9 +17,13 @@ urlpatterns = [
     path('events/<int:event_id>/planning', views.event_planning, name='event_planning'),
     path('events/<int:event_id>/rsvp', views.event_rsvp, name='event_rsvp'),
     path('events/<int:event_id>/attendance', views.event_attendance, name='event_attendance'),
+    path('events/<int:event_id>/check-in', views.event_check_in, name='event_check_in'),
+    path('events/<int:event_id>/kiosk', views.event_kiosk, name='event_kiosk'),
+    path('events/<int:event_id>/kiosk/check-in', views.event_bulk_check_in, name='event_bulk_check_in'),
     path('events/<int:event_id>/feedback', views.event_feedback, name='event_feedback'),
     path('members/', views.member_index, name='members'),
     path('members/<int:member_id>', views.member_detail, name='member_detail'),
+    path('members/skills', views.member_skill_search, name='member_skill_search'),
     path('core-team/', views.core_team, name='core_team'),
     path('core-team/email', views.core_team_email, name='core_team_email'),
     path('core-team/roadmap', views.roadmap_index, name='roadmap'),
@@ -1,25 +1,36 @@
+import json
 import os
 import random
 import requests
 from django.shortcuts import get_object_or_404, render
-from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.views.decorators.http import condition, require_POST
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.exceptions import ObjectDoesNotExist
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.conf import settings
 
 from .logger import logger
-from .email import send_templated_email
+from .email import queue_templated_email
+from .caching import cache_anonymous_page
+from .ical import render_calendar
 
 from django.contrib.auth.models import User, Group
 from django.contrib import messages
 
-from .models import Member, FAQ, Event, Project, Update, EventAttendance, EventRSVP, EventFeedback, RoadmapMilestone
+from .models import Member, Tag, FAQ, Event, Project, Update, EventAttendance, EventRSVP, EventFeedback, RoadmapMilestone, Task
 from .forms import MemberAccountForm, EventFeedbackForm
 from django.utils import timezone
 from django.db import IntegrityError
+from django.db.models import Count, Max, Prefetch, Q
+from datetime import datetime
 
-from .google_api import drive_service
+from .google_api import list_slideshows
 
 from .twitter_api import tweet
 
@@ -28,6 +39,7 @@ def verified_member_check(user):
     return user.is_authenticated and (user.member.verified or user.is_staff)
 
 
+@cache_anonymous_page()
 def index(request):
     if request.user.is_authenticated:
         now = timezone.now()
@@ -44,8 +56,7 @@ def index(request):
 
         return render(request, 'club/index.html', {'ongoing_event': ongoing_event, 'upcoming_rsvps': upcoming_rsvps})
     else:
-        core_team = User.objects.filter(is_staff=True)
-        today = timezone.now().date()
+        core_team = User.objects.filter(is_staff=True).select_related('member').prefetch_related('groups')
         try:
             closest_event = Event.public_events.latest()
         except ObjectDoesNotExist:
@@ -77,6 +88,13 @@ def conduct(request):
 
 @login_required
 def user_account(request):
+    if request.method == 'POST' and 'reset-calendar-feed' in request.POST:
+        # New calendar feed link, the old one stops working
+        request.user.member.reset_calendar_feed_secret()
+        logger.info(f'Reset the calendar feed link of user {request.user}')
+        messages.info(request, 'Your calendar link was reset. Update it in your calendar app, the old link no longer works.')
+        return HttpResponseRedirect(request.path_info)
+
     # if this is a POST request we need to process the form data
     if request.method == 'POST':
         # create a form instance and populate it with data from the request:
@@ -100,15 +118,12 @@ def user_account(request):
                     'verification_code': request.user.member.verification_code,
                     'website': settings.DOMAIN
                 }
-                send_templated_email('Verify School Account', 'verification_code', email_data, [
-                                     request.user.member.school_email])
-
-            if 'profile_image' in request.FILES:
-                messages.warning(request, 'Uploaded profile image!')
-                profile_image = request.FILES['profile_image']
-                name, extension = os.path.splitext(profile_image.name)
-                request.user.member.profile_image.save(
-                    f'{request.user.username}{extension}', profile_image)
+                queue_templated_email('Verify School Account', 'verification_code', email_data, [
+                                     request.user.member.school_email], priority=Task.PRIORITY_HIGH)
+
+            if form.cleaned_data['profile_image']:
+                request.user.member.queue_profile_image(form.cleaned_data['profile_image'])
+                messages.info(request, 'Uploaded profile image! It will show up once it has been resized.')
             request.user.save()
             request.user.member.save()
 
@@ -130,8 +145,8 @@ def user_account(request):
                 'verification_code': request.user.member.verification_code,
                 'website': settings.DOMAIN
             }
-            send_templated_email('Verify School Account', 'verification_code', email_data, [
-                                 request.user.member.school_email])
+            queue_templated_email('Verify School Account', 'verification_code', email_data, [
+                                 request.user.member.school_email], priority=Task.PRIORITY_HIGH)
             logger.info(
                 f'Resent school account verification email for user {request.user} to {request.user.member.school_email}')
             messages.info(
@@ -159,7 +174,8 @@ def user_account(request):
         }
         form = MemberAccountForm(form_data)
 
-    return render(request, 'registration/account.html', {'form': form})
+    calendar_feed_url = request.build_absolute_uri(reverse('member_calendar_feed', args=[request.user.member.calendar_feed_token]))
+    return render(request, 'registration/account.html', {'form': form, 'calendar_feed_url': calendar_feed_url})
 
 
 @login_required
@@ -186,10 +202,60 @@ def verify_account(request):
 # EVENTS
 
 
+# How many past events are shown at once on the events page
+PAST_EVENTS_PAGE_SIZE = 20
+
+
+def get_user_event_ids(user):
+    '''Returns the sets of IDs of the events the user RSVPed for and attended.'''
+    if not user.is_authenticated:
+        return set(), set()
+    return set(user.rsvps.values_list('event_id', flat=True)), set(user.attendance.values_list('event_id', flat=True))
+
+
+def add_user_state(events, user_rsvped_event_ids, user_attended_event_ids):
+    '''Evaluates the events and sets `user_rsvped` and `user_attended` on each of them.'''
+    events = list(events)
+    for event in events:
+        event.user_rsvped = event.id in user_rsvped_event_ids
+        event.user_attended = event.id in user_attended_event_ids
+    return events
+
+
+def get_past_events_page(request, before=None):
+    '''
+    Returns a page of events that ended before today, newest first, and the cursor for the next page
+    (None on the last page). Uses keyset pagination on (start, id) so every page costs the same
+    no matter how far back it is. `before` is the cursor returned for the previous page.
+
+    Raises ValueError for a malformed cursor.
+    '''
+    today = timezone.now().date()
+    if request.user.is_staff:
+        events = Event.objects.with_counts()
+    else:
+        events = Event.public_events.with_counts()
+    events = events.filter(end__lt=today).order_by('-start', '-id')
+
+    if before:
+        before_start, before_id = before.rsplit('_', 1)
+        before_start = datetime.fromisoformat(before_start)
+        before_id = int(before_id)
+        events = events.filter(Q(start__lt=before_start) | Q(start=before_start, id__lt=before_id))
+
+    page = list(events[:PAST_EVENTS_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(page) > PAST_EVENTS_PAGE_SIZE:
+        page = page[:PAST_EVENTS_PAGE_SIZE]
+        next_cursor = f'{page[-1].start.isoformat()}_{page[-1].id}'
+    return page, next_cursor
+
+
+@cache_anonymous_page('past_before')
 def event_index(request):
     '''
     Display upcoming and past Events. Also shows a Google Calendar widget displaying all
-    events.
+    events. Uses a fixed number of queries no matter how many events there are.
 
     **Context**
 
@@ -197,7 +263,14 @@ def event_index(request):
         A list of all non-hidden :model:`club.Event` that start on or after the current day.
 
     ``past_events``
-        A list of all non-hidden :model:`club.Event` that ended before the current day. 
+        The first page of non-hidden :model:`club.Event` that ended before the current day.
+        More are loaded from :view:`club.views.event_past_index`.
+
+    ``past_events_next``
+        The cursor for the next page of past events, if there is one.
+
+    Every event has ``rsvp_count`` and ``attendance_count`` plus ``user_rsvped`` and
+    ``user_attended`` for the current user.
 
     **Template:**
 
@@ -206,44 +279,115 @@ def event_index(request):
     now = timezone.now()
     today = now.date()
 
-    if request.user.is_authenticated:
-        user_rsvped_events = list(
-            map(lambda rsvp: rsvp.event, request.user.rsvps.all()))
-        user_attended_events = list(
-            map(lambda attnd: attnd.event, request.user.attendance.all()))
-    else:
-        user_rsvped_events = []
-        user_attended_events = []
+    user_rsvped_event_ids, user_attended_event_ids = get_user_event_ids(request.user)
 
     # Start by getting ALL events and then filter based on user
     if request.user.is_staff:
-        ongoing_events = Event.objects.filter(
-            start__lte=now, end__gte=now)
-        upcoming_events = Event.objects.filter(
-            start__gte=today).order_by('start')
-        past_events = Event.objects.filter(
-            end__lt=today)
+        events = Event.objects.with_counts()
     else:
         # Non-core team
-        ongoing_events = Event.public_events.filter(
-            start__lte=now, end__gte=now)
-        upcoming_events = Event.public_events.filter(
-            start__gte=today).order_by('start')
-        past_events = Event.public_events.filter(
-            end__lt=today)
+        events = Event.public_events.with_counts()
+
+    ongoing_events = events.filter(
+        start__lte=now, end__gte=now)
+    upcoming_events = events.filter(
+        start__gte=today).order_by('start')
+
+    try:
+        past_events, past_events_next = get_past_events_page(request, request.GET.get('past_before'))
+    except ValueError:
+        past_events, past_events_next = get_past_events_page(request)
 
     context = {
-        'user_rsvped_events': user_rsvped_events,
-        'user_attended_events': user_attended_events,
-        'ongoing_events': ongoing_events,
-        'upcoming_events': upcoming_events,
-        'past_events': past_events,
+        'ongoing_events': add_user_state(ongoing_events, user_rsvped_event_ids, user_attended_event_ids),
+        'upcoming_events': add_user_state(upcoming_events, user_rsvped_event_ids, user_attended_event_ids),
+        'past_events': add_user_state(past_events, user_rsvped_event_ids, user_attended_event_ids),
+        'past_events_next': past_events_next,
         'google_calendar_id': settings.GOOGLE_CALENDAR_ID
     }
 
     return render(request, 'club/events/index.html', context)
 
 
+@cache_anonymous_page('before')
+def event_past_index(request):
+    '''
+    Returns the next page of past events as JSON for infinite scrolling on the events page.
+
+    ``before`` (GET)
+        The cursor of the previous page.
+
+    **Response**
+        ``html`` the rendered table rows and ``next`` the cursor for the following page or null.
+    '''
+    try:
+        past_events, past_events_next = get_past_events_page(request, request.GET.get('before'))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    user_rsvped_event_ids, user_attended_event_ids = get_user_event_ids(request.user)
+    html = render_to_string('club/events/includes/past_event_rows.html', {
+        'past_events': add_user_state(past_events, user_rsvped_event_ids, user_attended_event_ids)
+    }, request=request)
+    return JsonResponse({'html': html, 'next': past_events_next})
+
+
+# Seconds to keep a rendered calendar feed. Feeds are cached under their version, so this only limits how long old versions linger
+CALENDAR_FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+def get_public_feed_state(request):
+    '''
+    The version of the public events feed: the number of public events and when the latest
+    one was updated, which changes whenever one is created, edited, hidden or deleted.
+    Fetched with one query and kept on the request for the ETag, Last-Modified and view.
+    '''
+    if not hasattr(request, 'public_feed_state'):
+        request.public_feed_state = Event.public_events.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    return request.public_feed_state
+
+
+def public_feed_etag(request):
+    state = get_public_feed_state(request)
+    last_modified = state['last_modified'].timestamp() if state['last_modified'] else 0
+    return f'{state["count"]}-{last_modified}'
+
+
+def public_feed_last_modified(request):
+    return get_public_feed_state(request)['last_modified']
+
+
+@condition(etag_func=public_feed_etag, last_modified_func=public_feed_last_modified)
+def event_calendar_feed(request):
+    '''
+    An iCalendar feed of every public :model:`club.Event` for calendar apps to subscribe to.
+    Calendar apps poll it often, so unchanged feeds are answered with 304 Not Modified and
+    the rendered feed is cached until the events change. Either way it costs one query.
+    '''
+    key = f'event-calendar-feed:{public_feed_etag(request)}'
+    content = cache.get(key)
+    if content is None:
+        content = render_calendar(f'DSC {settings.SCHOOL_NAME_SHORT} Events', Event.public_events.order_by('start'))
+        cache.set(key, content, CALENDAR_FEED_CACHE_TIMEOUT)
+    return HttpResponse(content, content_type='text/calendar; charset=utf-8')
+
+
+def member_calendar_feed(request, token):
+    '''
+    An iCalendar feed of the :model:`club.Event` a member RSVPed for, at a secret URL with their
+    calendar feed token. The token is checked by its signature and the feed comes from the cache
+    together with the member's current calendar feed secret, so polling it doesn't use the session
+    or the database unless the feed changed.
+    '''
+    try:
+        user_id, secret = Member.parse_calendar_feed_token(token)
+    except signing.BadSignature:
+        raise Http404
+    content = EventRSVP.get_calendar_feed(user_id, secret)
+    if content is None:
+        raise Http404
+    return HttpResponse(content, content_type='text/calendar; charset=utf-8')
+
+
 def event_detail(request, event_id):
     '''
     Display an individual :model:`club.Event`.
@@ -256,15 +400,28 @@ def event_detail(request, event_id):
         Whether the current user has verified their attendance at this event.
     ``rsvp``
         The RSVP for the current user (if exists).
+    ``feedback_submitted``
+        Whether the current user has already given feedback for this event.
+
+    Makes a fixed number of queries: the event with the user's state, its agenda and,
+    for the core team, the RSVPs and attendance with their members.
 
     **Template:**
 
     :template:`club/events/detail.html`
     '''
 
-    # Context variables
-    now = timezone.now()
-    event = get_object_or_404(Event, pk=event_id)
+    # The event, the user's RSVP, attendance and feedback come from one query
+    events = Event.objects.prefetch_related('agenda')
+    if request.user.is_authenticated:
+        events = events.with_user_state(request.user)
+    if request.user.is_staff:
+        events = events.prefetch_related(
+            Prefetch('rsvps', queryset=EventRSVP.objects.select_related('user__member')),
+            Prefetch('attendance', queryset=EventAttendance.objects.select_related('user__member')))
+    event = get_object_or_404(events, pk=event_id)
+    # Every "has the event started" check during this request uses the same time
+    event.time_snapshot = timezone.now()
 
     # Prevent acces if event is hidden or Core Team only
     if not event.is_publicly_visible and not request.user.is_staff:
@@ -277,25 +434,21 @@ def event_detail(request, event_id):
     
     # Make sure user is logged in to allow attendance, rsvping, etc.
     if request.user.is_authenticated:
-        attendance_submitted = event.attendance.filter(
-            user=request.user).exists()
+        attendance_submitted = event.user_attended
+        feedback_submitted = event.user_gave_feedback
         show_rsvp_form = 'rsvp' in request.GET and request.GET['rsvp'] == '1'
-        rsvp = event.rsvps.filter(user=request.user).first()
-        show_slideshows = 'select-slideshow' in request.GET and request.GET['select-slideshow'] == '1'
+        rsvp = EventRSVP(event=event, user=request.user, message=event.user_rsvp_message) if event.user_rsvped else None
+        show_slideshows = request.user.is_staff and request.GET.get('select-slideshow') == '1'
         show_submit_attendance = 'submit-attendance' in request.GET and request.GET['submit-attendance'] == '1'
         show_submit_feedback = 'submit-feedback' in request.GET and request.GET['submit-feedback'] == '1'
         feedback_form = EventFeedbackForm()
     else:
         feedback_form = None
         attendance_submitted = False
+        feedback_submitted = False
         rsvp = None
         show_slideshows = False
 
-    slideshows = []
-    if show_slideshows:
-        slideshows = drive_service.files().list(corpora='user',
-                                                q=f"'{settings.GOOGLE_DRIVE_SLIDE_DECKS_FOLDER_ID}' in parents").execute().get('files')
-
     # Staff actions
     if request.user.is_staff and request.method == 'POST':
         if 'create-document' in request.POST and request.POST['create-document'] == 'meeting-notes':
@@ -305,13 +458,14 @@ def event_detail(request, event_id):
         elif 'slideshow-id' in request.POST:
             if request.POST['slideshow-id'] == 'none':
                 event.slideshow_id = None
-                event.thumbnail_link = None
             else:
                 event.slideshow_id = request.POST['slideshow-id']
-                event.get_thumbnail_link()
+            # The new thumbnail is fetched in the background after saving
+            event.thumbnail_link = None
+            event.thumbnail_hash = None
             event.save()
             messages.success(
-                request, 'Successfully selected slideshow for event.')
+                request, 'Successfully selected slideshow for event. Its thumbnail will show up shortly.')
             show_slideshows = False
         elif 'review' in request.POST:
             event.review = request.POST['review']
@@ -321,11 +475,16 @@ def event_detail(request, event_id):
 
         return HttpResponseRedirect(request.path_info)
 
+    slideshows = []
+    if show_slideshows:
+        slideshows = list_slideshows(refresh=request.GET.get('refresh-slideshows') == '1')
+
     context = {
         'event': event,
         'show_rsvp_form': show_rsvp_form,
         'rsvp': rsvp,
         'attendance_submitted': attendance_submitted,
+        'feedback_submitted': feedback_submitted,
         'show_slideshows': show_slideshows,
         'show_submit_attendance': show_submit_attendance,
         'show_submit_feedback': show_submit_feedback,
@@ -428,6 +587,86 @@ def event_attendance(request, event_id):
 
     return HttpResponseRedirect(f'/events/{event_id}')
 
+@require_POST
+def event_check_in(request, event_id):
+    '''
+    Records the current member's attendance from the attendance code shown during the event
+    and answers with JSON, so the attendance form can submit it without reloading the page.
+
+    Built for the whole room submitting at once: the event's code and times come from the cache,
+    nothing is written but the attendance and duplicate check-ins are ignored by the insert.
+
+    **Response**
+        ``message`` on success or ``error`` with a 4xx status.
+    '''
+    # A single EXISTS query instead of loading the member like verified_member_check
+    is_member = request.user.is_authenticated and (
+        request.user.is_staff or Member.verified_members.filter(user=request.user).exists())
+    if not is_member:
+        return JsonResponse({'error': 'Only verified members can submit attendance codes.'}, status=403)
+
+    window = Event.get_check_in_window(event_id)
+    if window is None:
+        return JsonResponse({'error': 'No such event.'}, status=404)
+    attendance_code, start, end = window
+
+    if not start <= timezone.now() <= end:
+        return JsonResponse({'error': 'You can only submit the attendance code during the event. Reach out to a Core Team member if you have issues.'}, status=400)
+    submitted_code = request.POST.get('attendance-code', '').strip()
+    if not attendance_code or submitted_code.upper() != attendance_code.upper():
+        return JsonResponse({'error': 'Wrong attendance code. Please make sure you\'re on the right event and have typed in the code correctly.'}, status=400)
+
+    # Submitting twice is harmless, the second insert is ignored by the unique constraint
+    EventAttendance.objects.bulk_create([EventAttendance(user=request.user, event_id=event_id)], ignore_conflicts=True)
+    return JsonResponse({'message': 'Successfully recorded your attendance. Thanks for coming!'})
+
+
+# The most check-ins the kiosk may send in one request
+CHECK_IN_BATCH_SIZE = 200
+
+@staff_member_required
+def event_kiosk(request, event_id):
+    '''
+    A check-in kiosk for the core team to run at the door. It scans the QR codes on members'
+    account pages, queues the check-ins in the browser (so scanning continues while offline)
+    and sends them to :view:`club.views.event_bulk_check_in` in batches.
+
+    **Template:**
+
+    :template:`club/events/kiosk.html`
+    '''
+    event = get_object_or_404(Event, pk=event_id)
+    return render(request, 'club/events/kiosk.html', {'event': event, 'batch_size': CHECK_IN_BATCH_SIZE})
+
+
+@staff_member_required
+@require_POST
+def event_bulk_check_in(request, event_id):
+    '''
+    Records the attendance of a batch of members scanned by the kiosk.
+
+    **Request**
+        JSON ``{"tokens": [...]}`` with the members' check-in tokens.
+
+    **Response**
+        ``results``, one per token with its ``status`` and the member's ``name`` when known.
+    '''
+    event = get_object_or_404(Event, pk=event_id)
+    try:
+        tokens = json.loads(request.body)['tokens']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Expected a JSON object with a list of tokens.'}, status=400)
+    if not isinstance(tokens, list) or not all(isinstance(token, str) for token in tokens):
+        return JsonResponse({'error': 'Expected a JSON object with a list of tokens.'}, status=400)
+    if len(tokens) > CHECK_IN_BATCH_SIZE:
+        return JsonResponse({'error': f'Send at most {CHECK_IN_BATCH_SIZE} check-ins at once.'}, status=400)
+
+    results = event.check_in_members(tokens)
+    checked_in = sum(result['status'] == 'checked_in' for result in results)
+    logger.info(f'{request.user} checked in {checked_in} of {len(tokens)} scanned members to {event}.')
+    return JsonResponse({'results': results})
+
+
 @user_passes_test(verified_member_check, login_url='/account', redirect_field_name=None)
 def event_feedback(request, event_id):
     now = timezone.now()
@@ -487,6 +726,7 @@ def project_index(request):
     return render(request, 'club/projects/index.html', {'projects': projects})
 
 
+@cache_anonymous_page()
 def update_index(request):
     '''
     Lists all club :model:`club.Update` (posts, news, recaps, etc.)
@@ -512,17 +752,78 @@ def update_detail(request, update_id):
     return render(request, 'club/updates/detail.html', {'update': update})
 
 
+# How many members are shown per page of the members directory
+MEMBERS_PAGE_SIZE = 48
+
 @user_passes_test(verified_member_check, login_url='/account', redirect_field_name=None)
 def member_index(request):
-    # TODO: docstring
-    members = Member.verified_members.all()
-    return render(request, 'club/members/index.html', {'members': members})
+    '''
+    Lists verified members a page at a time, optionally filtered by a search query
+    (matched against the precomputed Member.search_text), grade and skill.
+    '''
+    members = Member.verified_members.select_related('user').order_by('user__first_name', 'user__last_name', 'id')
+
+    query = request.GET.get('q', '').strip()
+    if query:
+        # search_text is lowercased so a case-sensitive match can use the trigram index
+        for term in query.lower().split():
+            members = members.filter(search_text__contains=term)
+    grade = request.GET.get('grade')
+    if grade:
+        members = members.filter(grade=grade)
+    skill = request.GET.get('skill')
+    if skill and skill.isdigit():
+        members = members.filter(tags=skill)
+
+    page = Paginator(members, MEMBERS_PAGE_SIZE).get_page(request.GET.get('page'))
+
+    # Keep the filters in the pagination links
+    filters = request.GET.copy()
+    filters.pop('page', None)
+
+    return render(request, 'club/members/index.html', {
+        'page': page,
+        'members': page.object_list,
+        'query': query,
+        'grade': grade,
+        'skill': skill,
+        'grades': Member.GRADE_TYPES,
+        'skills': Tag.skills.all(),
+        'filters': filters.urlencode()
+    })
+
+
+@staff_member_required
+def member_skill_search(request):
+    '''
+    Finds verified members by their skills for the core team, e.g. to recruit Study Jam speakers.
+    Takes one or more `skill` tag titles and `match=any` to match members with any instead of all of them.
+    '''
+    titles = [title.strip() for title in request.GET.getlist('skill') if title.strip()]
+    if not titles:
+        return JsonResponse({'error': 'Pass at least one skill.'}, status=400)
+    match_all = request.GET.get('match', 'all') != 'any'
+
+    members = Member.verified_members.with_skills(titles, match_all).select_related('user').order_by(
+        '-matched_skills', 'user__first_name', 'user__last_name')
+    return JsonResponse({
+        'skills': titles,
+        'match': 'all' if match_all else 'any',
+        'members': [{
+            'id': member.id,
+            'name': member.user.get_full_name(),
+            'email': member.user.email,
+            'grade': member.get_grade_display(),
+            'matched_skills': member.matched_skills,
+            'url': reverse('member_detail', args=[member.id])
+        } for member in members]
+    })
 
 
 @user_passes_test(verified_member_check, login_url='/account', redirect_field_name=None)
 def member_detail(request, member_id):
     # TODO: docstring
-    member = get_object_or_404(Member, pk=member_id)
+    member = get_object_or_404(Member.objects.select_related('user').prefetch_related('tags'), pk=member_id)
     if not member.verified:
         messages.warning(
             request, 'This user has not yet verified their account!')
@@ -590,10 +891,10 @@ def core_team_email(request):
         else:
             if settings.DEBUG:
                 messages.warning(request, f'Sent to only {settings.GOOGLE_ACCOUNT} since in dev mode.')
-                send_templated_email(request.POST['email-subject'], 'update', data, [settings.GOOGLE_ACCOUNT])
+                queue_templated_email(request.POST['email-subject'], 'update', data, [settings.GOOGLE_ACCOUNT], priority=Task.PRIORITY_LOW)
             else:
-                send_templated_email(request.POST['email-subject'], 'update', data, verified_member_email_list)
-                messages.success(request, f'Sent email to all verified members!')
+                queue_templated_email(request.POST['email-subject'], 'update', data, verified_member_email_list, priority=Task.PRIORITY_LOW)
+                messages.success(request, f'Queued email to all verified members! Failed sends show up under dead letters in the admin.')
             return HttpResponseRedirect(request.path_info)
 
 
@@ -626,21 +927,25 @@ def social_media(request):
 
 @staff_member_required
 def member_management(request):
-    unverified_members = Member.objects.filter(verified=False, school_username__isnull=False)
-    verified_members = Member.verified_members.all()
-
-    if request.method == 'POST' and 'verify-member-id' in request.POST:
-        # Verify specified member
-        member = Member.objects.get(pk=request.POST['verify-member-id'])
-        if member is None:
-            messages.warning(request, f'No such member found!')
-        elif member.verified:
-            messages.warning(request, f'{member.user.get_full_name()} is already verfified!')
+    unverified_members = Member.objects.filter(verified=False, school_username__isnull=False).select_related('user')
+    verified_members = Member.verified_members.select_related('user')
+
+    if request.method == 'POST':
+        # Either the Verify button of one member or the checked members with "Verify selected"
+        member_ids = request.POST.getlist('verify-member-ids')
+        if 'verify-member-id' in request.POST:
+            member_ids = [request.POST['verify-member-id']]
+        member_ids = [member_id for member_id in member_ids if member_id.isdigit()]
+
+        members = Member.objects.filter(pk__in=member_ids).select_related('user')
+        verified = Member.verify_many(members)
+        if not verified:
+            messages.warning(request, 'No members to verify were selected!')
+        elif len(verified) == 1:
+            messages.success(request, f'Successfully verified {verified[0].user.get_full_name()}!')
         else:
-            member.verify()
-            member.save()
-            messages.success(request, f'Successfully verified {member.user.get_full_name()}!')
-            return HttpResponseRedirect(request.path_info)
+            messages.success(request, f'Successfully verified {len(verified)} members! Their Slack invites are being sent.')
+        return HttpResponseRedirect(request.path_info)
 
     context = {
         'unverified_members': unverified_members,
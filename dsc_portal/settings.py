@@ -77,6 +77,8 @@ MIDDLEWARE = [
     # Simplified static file serving.
     # https://warehouse.python.org/project/whitenoise/
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Counts queries and external API calls per request, see REQUEST_INSTRUMENTATION
+    'club.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +89,10 @@ MIDDLEWARE = [
     'social_django.middleware.SocialAuthExceptionMiddleware'
 ]
 
+# Log the query count, DB time and external API time of every request and add Server-Timing
+# headers for the core team. Set REQUEST_INSTRUMENTATION=off to turn it off.
+REQUEST_INSTRUMENTATION = os.environ.get('REQUEST_INSTRUMENTATION', 'on') != 'off'
+
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Extra places for collectstatic to find static files.
@@ -108,8 +114,8 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'club.context_processors.add_school',
-                'social_django.context_processors.backends',
-                'social_django.context_processors.login_redirect'
+                # Lazy, the backends are only looked up if a template uses them
+                'social_django.context_processors.backends'
             ],
         },
     },
@@ -133,6 +139,22 @@ else:
         'default': dj_database_url.parse(os.environ['DATABASE_URL'], conn_max_age=600)
     }
 
+    # The web and worker processes share the cache through Redis (the Heroku Redis add-on sets
+    # REDIS_URL), so invalidating a cached page or API response in one process is seen by the
+    # others. A cache hit is a sub-millisecond round trip that never touches the database.
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            }
+        }
+    }
+    # Sessions are read from Redis and only fall back to the database on a miss, so requests
+    # like attendance check-ins don't spend a query on the session
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
     SECURE_CONTENT_TYPE_NOSNIFF = True
     SECURE_BROWSER_XSS_FILTER = True
     SECURE_SSL_REDIRECT = True
@@ -216,6 +238,9 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = 'apikey'
 EMAIL_HOST_PASSWORD = os.environ['SENDGRID_API_KEY']
 EMAIL_SENDER = os.environ['EMAIL_SENDER']
+# Bulk emails reuse one SMTP connection per batch of recipients and send batches in parallel
+EMAIL_BATCH_SIZE = 100
+EMAIL_SEND_WORKERS = 4
 
 # DSC GOOGLE ACCOUNT
 GOOGLE_ACCOUNT = os.environ['GOOGLE_ACCOUNT']
@@ -241,6 +266,10 @@ GOOGLE_CALENDAR_ID = os.environ['GOOGLE_CALENDAR_ID']
 GS_PROJECT_ID = os.environ['GS_PROJECT_ID']
 GS_BUCKET_NAME = os.environ['GS_BUCKET_NAME']
 GS_DEFAULT_ACL = 'publicRead'
+# Uploaded images are stored under content hashes, so they can be cached forever
+GS_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Raw uploads that haven't been processed yet are stored privately, see club/storage.py
+PRIVATE_FILE_STORAGE = 'club.storage.PrivateGoogleCloudStorage'
 GS_SCOPES = ['https://www.googleapis.com/auth/drive', 'https://www.googleapis.com/auth/calendar', 'https://www.googleapis.com/auth/devstorage.read_write']
 GS_CREDENTIALS = service_account.Credentials.from_service_account_info(json.loads(os.environ['GOOGLE_SERVICE_ACCOUNT_JSON']), scopes=GS_SCOPES)
 